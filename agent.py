@@ -74,6 +74,8 @@ class UniversalAgent:
             api_key=config.api_key,
             tenant_id=config.tenant_id,
             buffer=self.buffer,
+            compression=config.export_compression,
+            max_flush_interval=config.max_flush_interval,
         )
         
         # Discovery modules
@@ -188,7 +190,7 @@ class UniversalAgent:
         await self.exporter.send_topology({
             "processes": processes,
             "containers": containers,
-            "connections": connections,
+            "connections": [conn.to_dict() for conn in connections],
         })
     
     async def _periodic_discovery(self):
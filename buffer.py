@@ -8,11 +8,14 @@ from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 import gzip
 
 logger = logging.getLogger(__name__)
 
+# Delivery attempts before a buffered item is dropped
+MAX_ATTEMPTS = 5
+
 
 @dataclass
 class BufferedData:
@@ -67,6 +70,13 @@ class DataBuffer:
             "topology": deque(maxlen=1000),
         }
         
+        # Types that may have spill files on disk. Files survive restarts,
+        # so every type starts out unknown until a read finds none left.
+        self._spill_types = set(self._buffers)
+        # Types whose spill files are being read right now, so a concurrent
+        # get_batch_combined doesn't read the same files twice
+        self._spill_reading: Set[str] = set()
+        
         self._lock = asyncio.Lock()
         self._stats = {
             "total_added": 0,
@@ -115,23 +125,127 @@ class DataBuffer:
                 return []
             
             buffer = self._buffers[data_type]
-            batch = []
-            
-            while buffer and len(batch) < max_items:
-                batch.append(buffer.popleft())
+            # Size is known up front: pop exactly that many, no per-item checks
+            batch = [buffer.popleft() for _ in range(min(len(buffer), max_items))]
             
             self._stats["total_flushed"] += len(batch)
             return batch
     
-    async def return_failed(self, items: List[BufferedData]):
-        """Return failed items to the buffer for retry."""
+    async def get_batch_combined(self, data_type: str, max_items: int = 1000) -> List[BufferedData]:
+        """
+        Get a batch from memory, topping it up from spilled files.
+        
+        In-memory items come first; any remaining budget is filled from
+        this type's spill files, newest first (LIFO). Items from a file that
+        don't fit are moved back into the in-memory buffer.
+        """
+        async with self._lock:
+            if data_type not in self._buffers:
+                return []
+            
+            buffer = self._buffers[data_type]
+            batch = [buffer.popleft() for _ in range(min(len(buffer), max_items))]
+            read_spill = (
+                len(batch) < max_items
+                and data_type in self._spill_types
+                and data_type not in self._spill_reading
+            )
+            spill_count = self._stats["spill_count"]
+        
+        if read_spill:
+            # File reads and deletes run in a worker thread with the lock
+            # released, so neither the event loop nor other buffer users wait
+            # on disk I/O
+            self._spill_reading.add(data_type)
+            try:
+                items, exhausted = await asyncio.to_thread(
+                    self._take_spilled, data_type, max_items - len(batch)
+                )
+            finally:
+                self._spill_reading.discard(data_type)
+            
+            room = max_items - len(batch)
+            batch.extend(BufferedData(data_type=data_type, payload=item) for item in items[:room])
+            leftovers = items[room:]
+            
+            async with self._lock:
+                if leftovers:
+                    # New data may have arrived meanwhile; keep what fits
+                    free = buffer.maxlen - len(buffer)
+                    buffer.extend(BufferedData(data_type=data_type, payload=item) for item in leftovers[:free])
+                    dropped = len(leftovers) - free
+                    if dropped > 0:
+                        self.record_dropped(dropped)
+                        logger.warning(f"Dropped {dropped} recovered {data_type} items: buffer full")
+                # A file spilled while we were reading may not have been seen
+                if exhausted and self._stats["spill_count"] == spill_count:
+                    self._spill_types.discard(data_type)
+        
+        self._stats["total_flushed"] += len(batch)
+        return batch
+    
+    def _take_spilled(self, data_type: str, max_items: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Read and delete this type's spill files, newest first, until at
+        least max_items items are collected (runs in a worker thread).
+        
+        Returns the items and whether every spill file was consumed.
+        """
+        spill_files = sorted(
+            self.spill_path.glob(f"{data_type}_*.json.gz"),
+            key=lambda f: f.stat().st_mtime,
+            reverse=True,  # Newest first (LIFO)
+        )
+        items: List[Dict[str, Any]] = []
+        remaining = len(spill_files)
+        for filepath in spill_files:
+            if len(items) >= max_items:
+                break
+            remaining -= 1
+            try:
+                with gzip.open(filepath, "rt") as f:
+                    items.extend(json.load(f))
+            except Exception as e:
+                logger.error(f"Failed to recover {filepath}: {e}")
+            
+            try:
+                filepath.unlink()
+            except OSError as e:
+                logger.warning(f"Failed to delete spill file {filepath}: {e}")
+        
+        if items:
+            logger.info(f"Recovered {len(items)} {data_type} items from disk")
+        return items, not remaining
+    
+    async def return_failed(self, items: List[BufferedData], count_attempt: bool = True):
+        """
+        Return failed items to the buffer for retry.
+        
+        Pass count_attempt=False for items whose failed attempt has already
+        been counted, so it isn't counted twice.
+        """
+        dropped = 0
         async with self._lock:
             for item in items:
-                item.attempts += 1
-                if item.attempts < 5:  # Max 5 retries
+                if count_attempt:
+                    item.attempts += 1
+                if item.attempts < MAX_ATTEMPTS:
                     buffer = self._buffers.get(item.data_type)
                     if buffer is not None:
+                        if len(buffer) == buffer.maxlen:
+                            # A full deque evicts its newest item to make room
+                            dropped += 1
                         buffer.appendleft(item)
+                else:
+                    dropped += 1
+        
+        if dropped:
+            self.record_dropped(dropped)
+            logger.warning(f"Dropped {dropped} items returned for retry (attempts exhausted or buffer full)")
+    
+    def record_dropped(self, count: int):
+        """Count items given up on outside the buffer (e.g. exhausted retries)."""
+        self._stats["drop_count"] += count
     
     def _compute_available_space(self, current_size: int) -> int:
         """Compute available disk space considering max_disk_ratio."""
@@ -239,6 +353,7 @@ class DataBuffer:
                     buffer.popleft()
             
             self._stats["spill_count"] += 1
+            self._spill_types.add(data_type)
             actual_size = filepath.stat().st_size
             logger.info(
                 f"Spilled {len(items)} {data_type} items to {filepath.name} "
@@ -334,6 +449,16 @@ class DataBuffer:
             },
         }
     
+    def total_pending(self, data_types: Optional[Iterable[str]] = None) -> int:
+        """Get items held in memory for the given types (all types by default)."""
+        if data_types is None:
+            return self.total_size
+        return sum(len(self._buffers[t]) for t in data_types if t in self._buffers)
+    
+    def has_spilled(self, data_types: Iterable[str]) -> bool:
+        """Whether any of the given types may still have data spilled to disk."""
+        return not self._spill_types.isdisjoint(data_types)
+    
     @property
     def total_size(self) -> int:
         """Get total items in buffer."""
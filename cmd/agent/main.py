@@ -132,10 +132,9 @@ def cmd_flare(args):
     
     setup_logging(args.debug)
     
-    output_path = args.output or f"devopsmate-agent-flare-{int(asyncio.get_event_loop().time())}.tar.gz"
-    
     print(f"Collecting diagnostic information...")
-    flare_path = collect_flare(output_path)
+    # collect_flare picks a timestamped name and extension for the codec in use
+    flare_path = collect_flare(args.output)
     
     print(f"Flare collected: {flare_path}")
     print("Please share this file with support for troubleshooting.")
@@ -147,7 +146,7 @@ def cmd_health(args):
     
     setup_logging(args.debug)
     
-    health = check_health()
+    health = check_health(fast=getattr(args, 'fast', False))
     
     if health['healthy']:
         print("Agent is healthy ✓")
@@ -217,10 +216,13 @@ Examples:
     
     # health command
     health_parser = subparsers.add_parser("health", help="Check agent health")
+    health_parser.add_argument("--fast", action="store_true", help="Stop at the first failure (for liveness probes)")
     health_parser.set_defaults(func=cmd_health)
     
     # diagnose command
     diagnose_parser = subparsers.add_parser("diagnose", help="Run comprehensive diagnostics")
+    diagnose_parser.add_argument("--deep", action="store_true", help="Fully import components instead of only locating them")
+    diagnose_parser.add_argument("--fast", action="store_true", help="Skip network checks")
     diagnose_parser.set_defaults(func=lambda args: __import__('agent.cmd.agent.subcommands.diagnose', fromlist=['cmd_diagnose']).cmd_diagnose(args))
     
     # integrations command
@@ -63,3 +63,5 @@ def cmd_check(args) -> None:
     except Exception as e:
         print(f"Error running check: {e}")
         sys.exit(1)
+    finally:
+        runner.close()
@@ -14,7 +14,10 @@ def cmd_diagnose(args) -> None:
     """Run comprehensive diagnostics."""
     from agent.internal.diagnostics.diagnose import run_diagnostics
     
-    results = run_diagnostics()
+    results = run_diagnostics(
+        deep=getattr(args, 'deep', False),
+        fast=getattr(args, 'fast', False),
+    )
     
     print("=== DevopsMate Agent Diagnostics ===\n")
     
@@ -62,11 +62,17 @@ class AgentConfig:
     # Network settings
     capture_network_flows: bool = True
     network_sample_rate: float = 0.1  # 10% sampling
+    network_include_udp: bool = False  # Topology discovery walks TCP tables only by default
+    include_kernel_connections: bool = False  # Keep connections with no owning PID
     
     # Buffer settings
     buffer_size: int = 10000
     max_batch_size: int = 1000
     
+    # Export settings
+    export_compression: str = "gzip"  # or "zstd", if the ingest endpoint accepts it
+    max_flush_interval: float = 60.0  # Ceiling for the flush interval while mostly idle
+    
     # Resource limits
     max_cpu_percent: float = 5.0
     max_memory_mb: int = 256
@@ -91,30 +97,44 @@ class AgentConfig:
     @classmethod
     def from_env(cls) -> "AgentConfig":
         """Create config from environment variables."""
-        return cls(
-            endpoint=os.getenv("DM_ENDPOINT", "http://localhost:8000/api/v1/ingest"),
-            api_key=os.getenv("DM_API_KEY", ""),
-            tenant_id=os.getenv("DM_TENANT_ID", ""),
-            collect_host_metrics=os.getenv("DM_COLLECT_HOST_METRICS", "true").lower() == "true",
-            collect_container_metrics=os.getenv("DM_COLLECT_CONTAINER_METRICS", "true").lower() == "true",
-            collect_logs=os.getenv("DM_COLLECT_LOGS", "true").lower() == "true",
-            collect_network=os.getenv("DM_COLLECT_NETWORK", "true").lower() == "true",
-            auto_instrument=os.getenv("DM_AUTO_INSTRUMENT", "true").lower() == "true",
-            host_metrics_interval=int(os.getenv("DM_HOST_METRICS_INTERVAL", "15")),
-            discovery_interval=int(os.getenv("DM_DISCOVERY_INTERVAL", "60")),
-            buffer_size=int(os.getenv("DM_BUFFER_SIZE", "10000")),
-        )
+        return cls(**{
+            attr: coerce(os.getenv(env, default))
+            for attr, env, coerce, default in _ENV_MAP
+        })
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary."""
-        return {
-            "endpoint": self.endpoint,
-            "tenant_id": self.tenant_id,
-            "collect_host_metrics": self.collect_host_metrics,
-            "collect_container_metrics": self.collect_container_metrics,
-            "collect_logs": self.collect_logs,
-            "collect_network": self.collect_network,
-            "auto_instrument": self.auto_instrument,
-            "host_metrics_interval": self.host_metrics_interval,
-            "discovery_interval": self.discovery_interval,
-        }
+        """Convert to dictionary (non-sensitive summary fields only)."""
+        return {name: getattr(self, name) for name in _DICT_FIELDS}
+
+
+def _to_bool(value: str) -> bool:
+    return value.lower() == "true"
+
+
+# Environment variable mapping: (attribute, env var, coercer, default)
+_ENV_MAP = (
+    ("endpoint", "DM_ENDPOINT", str, "http://localhost:8000/api/v1/ingest"),
+    ("api_key", "DM_API_KEY", str, ""),
+    ("tenant_id", "DM_TENANT_ID", str, ""),
+    ("collect_host_metrics", "DM_COLLECT_HOST_METRICS", _to_bool, "true"),
+    ("collect_container_metrics", "DM_COLLECT_CONTAINER_METRICS", _to_bool, "true"),
+    ("collect_logs", "DM_COLLECT_LOGS", _to_bool, "true"),
+    ("collect_network", "DM_COLLECT_NETWORK", _to_bool, "true"),
+    ("auto_instrument", "DM_AUTO_INSTRUMENT", _to_bool, "true"),
+    ("host_metrics_interval", "DM_HOST_METRICS_INTERVAL", int, "15"),
+    ("discovery_interval", "DM_DISCOVERY_INTERVAL", int, "60"),
+    ("buffer_size", "DM_BUFFER_SIZE", int, "10000"),
+)
+
+# Fields exposed by AgentConfig.to_dict (excludes credentials)
+_DICT_FIELDS = (
+    "endpoint",
+    "tenant_id",
+    "collect_host_metrics",
+    "collect_container_metrics",
+    "collect_logs",
+    "collect_network",
+    "auto_instrument",
+    "host_metrics_interval",
+    "discovery_interval",
+)
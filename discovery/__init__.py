@@ -2,10 +2,11 @@
 
 from .process_discovery import ProcessDiscovery
 from .container_discovery import ContainerDiscovery
-from .network_discovery import NetworkDiscovery
+from .network_discovery import NetworkDiscovery, Connection
 
 __all__ = [
     "ProcessDiscovery",
     "ContainerDiscovery",
     "NetworkDiscovery",
+    "Connection",
 ]
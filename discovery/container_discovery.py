@@ -1,8 +1,10 @@
 """Container and Kubernetes discovery."""
 
+import asyncio
 import logging
 import os
-from datetime import datetime
+import re
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -10,6 +12,13 @@ from agent.config import AgentConfig
 
 logger = logging.getLogger(__name__)
 
+# Non-sensitive env var prefixes that help identify the service
+_SAFE_ENV_RE = re.compile(
+    r"^(SERVICE_|APP_|SERVER_|NODE_ENV|FLASK_|DJANGO_|SPRING_|RAILS_ENV|PORT|HOST)"
+)
+# Keys that look like they hold secrets
+_SECRET_ENV_RE = re.compile(r"password|secret|key|token", re.IGNORECASE)
+
 
 class ContainerDiscovery:
     """
@@ -32,18 +41,22 @@ class ContainerDiscovery:
         """Discover all containers."""
         containers = []
         
-        # Discover Docker containers
-        docker_containers = await self._discover_docker()
+        # One timestamp for the whole scan
+        discovered_at = datetime.now(timezone.utc).isoformat()
+        
+        # The Docker and Kubernetes clients are blocking HTTP calls; run them
+        # in worker threads so they don't stall the event loop
+        docker_containers = await asyncio.to_thread(self._discover_docker, discovered_at)
         containers.extend(docker_containers)
         
         # Discover Kubernetes pods
         if self.config.kubernetes_enabled:
-            k8s_pods = await self._discover_kubernetes()
+            k8s_pods = await asyncio.to_thread(self._discover_kubernetes, discovered_at)
             containers.extend(k8s_pods)
         
         return containers
     
-    async def _discover_docker(self) -> List[Dict[str, Any]]:
+    def _discover_docker(self, discovered_at: str) -> List[Dict[str, Any]]:
         """Discover Docker containers."""
         containers = []
         
@@ -65,7 +78,7 @@ class ContainerDiscovery:
                     "env_vars": self._extract_env_hints(container),
                     "resource_limits": self._extract_resource_limits(container),
                     "runtime": "docker",
-                    "discovered_at": datetime.utcnow().isoformat(),
+                    "discovered_at": discovered_at,
                 })
         
         except ImportError:
@@ -99,18 +112,11 @@ class ContainerDiscovery:
         env_list = container.attrs.get("Config", {}).get("Env", []) or []
         
         # Only extract non-sensitive vars that help identify the service
-        safe_prefixes = [
-            "SERVICE_", "APP_", "SERVER_", "NODE_ENV", "FLASK_", "DJANGO_",
-            "SPRING_", "RAILS_ENV", "PORT", "HOST",
-        ]
-        
         for env in env_list:
             if "=" in env:
                 key, value = env.split("=", 1)
-                if any(key.startswith(prefix) for prefix in safe_prefixes):
-                    # Don't include values that look like secrets
-                    if not any(s in key.lower() for s in ["password", "secret", "key", "token"]):
-                        hints[key] = value[:100]  # Truncate
+                if _SAFE_ENV_RE.match(key) and not _SECRET_ENV_RE.search(key):
+                    hints[key] = value[:100]  # Truncate
         
         return hints
     
@@ -126,11 +132,9 @@ class ContainerDiscovery:
             "cpu_period": host_config.get("CpuPeriod", 0),
         }
     
-    async def _discover_kubernetes(self) -> List[Dict[str, Any]]:
-        """Discover Kubernetes pods."""
-        pods = []
-        
-        try:
+    def _get_k8s_client(self):
+        """Get the Kubernetes API client, loading cluster config on first use."""
+        if self._k8s_client is None:
             from kubernetes import client, config
             
             # Load config
@@ -139,7 +143,16 @@ class ContainerDiscovery:
             except config.ConfigException:
                 config.load_kube_config()
             
-            v1 = client.CoreV1Api()
+            self._k8s_client = client.CoreV1Api()
+        
+        return self._k8s_client
+    
+    def _discover_kubernetes(self, discovered_at: str) -> List[Dict[str, Any]]:
+        """Discover Kubernetes pods."""
+        pods = []
+        
+        try:
+            v1 = self._get_k8s_client()
             
             # Get pods in current namespace or all namespaces
             namespace = os.environ.get("POD_NAMESPACE")
@@ -161,7 +174,7 @@ class ContainerDiscovery:
                     "annotations": pod.metadata.annotations or {},
                     "containers": [],
                     "runtime": "kubernetes",
-                    "discovered_at": datetime.utcnow().isoformat(),
+                    "discovered_at": discovered_at,
                 }
                 
                 # Extract container info
@@ -1,9 +1,12 @@
 """Network connection discovery for topology building."""
 
+import asyncio
 import logging
+import os
 import socket
 import ipaddress
-from datetime import datetime
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Set, Tuple
 
 import psutil
@@ -12,6 +15,49 @@ from agent.config import AgentConfig
 
 logger = logging.getLogger(__name__)
 
+# Remote address prefixes (loopback / unspecified) that never form topology edges
+_SKIP_PREFIXES = ("127.", "::", "0.")
+
+_HAS_PROCFS = os.path.isdir("/proc/self")
+
+# Longest name /proc/<pid>/comm reports (TASK_COMM_LEN minus the NUL)
+_COMM_MAX_LEN = 15
+
+
+def _build_port_bitmap(ports) -> bytearray:
+    """Build a 65536-bit membership bitmap for a set of ports."""
+    bitmap = bytearray(65536 // 8)
+    for port in ports:
+        bitmap[port >> 3] |= 1 << (port & 7)
+    return bitmap
+
+
+def _port_in(bitmap: bytearray, port: int) -> int:
+    """Test a port against a bitmap built by _build_port_bitmap."""
+    return (bitmap[port >> 3] >> (port & 7)) & 1
+
+
+@dataclass(slots=True)
+class Connection:
+    """A discovered network connection."""
+    local_pid: Optional[int]
+    local_process: str
+    local_cmdline: str
+    local_addr: str
+    local_port: int
+    remote_addr: str
+    remote_hostname: str
+    remote_port: int
+    remote_service: str
+    status: str
+    protocol: str  # "tcp" or "udp"
+    direction: str  # "inbound" or "outbound"
+    discovered_at: str
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for the ingest API."""
+        return asdict(self)
+
 
 class NetworkDiscovery:
     """
@@ -52,6 +98,7 @@ class NetworkDiscovery:
         389: "ldap",
         636: "ldaps",
     }
+    _WELL_KNOWN_BITMAP = _build_port_bitmap(WELL_KNOWN_PORTS)
     
     def __init__(self, config: AgentConfig):
         self.config = config
@@ -60,41 +107,51 @@ class NetworkDiscovery:
         self._hostname_cache: Dict[str, str] = {}
         
         # Discovered connections
-        self._connections: List[Dict[str, Any]] = []
+        self._connections: List[Connection] = []
     
-    async def discover(self) -> List[Dict[str, Any]]:
+    async def discover(self) -> List[Connection]:
         """Discover all network connections."""
+        # The socket table walk, /proc reads and reverse DNS all block; run
+        # the scan in a worker thread so the event loop stays free
+        return await asyncio.to_thread(self._scan)
+    
+    def _scan(self) -> List[Connection]:
+        """Blocking body of discover()."""
         connections = []
         seen_connections: Set[Tuple] = set()
         
         try:
-            net_connections = psutil.net_connections(kind="inet")
+            # UDP entries are mostly transient (DNS, mDNS) and carry no topology signal
+            include_udp = self.config.network_include_udp
+            net_connections = psutil.net_connections(kind="inet" if include_udp else "tcp")
         except psutil.AccessDenied:
             logger.warning("Access denied for network connections")
             return connections
         
-        # Process mapping
+        # Process mapping, only for PIDs that actually own a connection
+        needed_pids = {c.pid for c in net_connections if c.pid}
         pid_to_process = {}
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-            try:
-                pid_to_process[proc.info['pid']] = {
-                    "name": proc.info['name'],
-                    "cmdline": ' '.join(proc.info['cmdline'] or [])[:200],
-                }
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                pass
+        for pid in needed_pids:
+            process_info = self._read_process_info(pid)
+            if process_info is not None:
+                pid_to_process[pid] = process_info
+        
+        # One timestamp for the whole batch
+        now_iso = datetime.now(timezone.utc).isoformat()
+        
+        include_kernel = self.config.include_kernel_connections
         
         for conn in net_connections:
+            # Kernel-owned sockets have no PID and would only be tagged "unknown"
+            if not conn.pid and not include_kernel:
+                continue
+            
             if not conn.laddr or not conn.raddr:
                 continue
             
             # Skip loopback and special addresses
             raddr_ip = conn.raddr.ip
-            if not raddr_ip or raddr_ip in ("0.0.0.0", "::", "::1", "127.0.0.1", "localhost"):
-                continue
-            
-            # Skip IPv6 if not supported or if it's a loopback
-            if raddr_ip.startswith("127.") or raddr_ip.startswith("::"):
+            if not raddr_ip or raddr_ip == "localhost" or raddr_ip.startswith(_SKIP_PREFIXES):
                 continue
             
             # Create unique connection key
@@ -122,29 +179,58 @@ class NetworkDiscovery:
                 logger.debug(f"Could not resolve hostname for {conn.raddr.ip}: {e}")
                 remote_hostname = conn.raddr.ip
             
-            connection_info = {
-                "local_pid": conn.pid,
-                "local_process": process_info["name"],
-                "local_cmdline": process_info["cmdline"],
-                "local_addr": conn.laddr.ip,
-                "local_port": conn.laddr.port,
-                "remote_addr": conn.raddr.ip,
-                "remote_hostname": remote_hostname,
-                "remote_port": conn.raddr.port,
-                "remote_service": remote_service,
-                "status": conn.status,
-                "protocol": "tcp" if conn.type == socket.SOCK_STREAM else "udp",
-                "direction": self._determine_direction(conn),
-                "discovered_at": datetime.utcnow().isoformat(),
-            }
-            
-            connections.append(connection_info)
+            connections.append(Connection(
+                local_pid=conn.pid,
+                local_process=process_info["name"],
+                local_cmdline=process_info["cmdline"],
+                local_addr=conn.laddr.ip,
+                local_port=conn.laddr.port,
+                remote_addr=conn.raddr.ip,
+                remote_hostname=remote_hostname,
+                remote_port=conn.raddr.port,
+                remote_service=remote_service,
+                status=conn.status,
+                protocol="tcp" if not include_udp or conn.type == socket.SOCK_STREAM else "udp",
+                direction=self._determine_direction(conn),
+                discovered_at=now_iso,
+            ))
         
         self._connections = connections
         logger.info(f"Discovered {len(connections)} network connections")
         
         return connections
     
+    def _read_process_info(self, pid: int) -> Optional[Dict[str, str]]:
+        """Read name and cmdline for a PID straight from /proc."""
+        if _HAS_PROCFS:
+            try:
+                with open(f"/proc/{pid}/comm", "rb") as f:
+                    name = f.read().decode(errors="replace").rstrip("\n")
+                with open(f"/proc/{pid}/cmdline", "rb") as f:
+                    cmdline = f.read().decode(errors="replace")
+                # The kernel cuts comm to 15 characters; recover the full
+                # name from argv[0] when it extends the truncated one, as
+                # psutil.Process.name() does
+                if len(name) == _COMM_MAX_LEN and cmdline:
+                    exe_name = os.path.basename(cmdline.split("\0", 1)[0])
+                    if exe_name.startswith(name):
+                        name = exe_name
+                cmdline = cmdline.replace("\0", " ").strip()
+                return {"name": name, "cmdline": cmdline[:200]}
+            except (FileNotFoundError, ProcessLookupError, PermissionError):
+                return None
+        
+        # No procfs (macOS, Windows): fall back to psutil for this one PID
+        try:
+            proc = psutil.Process(pid)
+            with proc.oneshot():
+                return {
+                    "name": proc.name(),
+                    "cmdline": ' '.join(proc.cmdline() or [])[:200],
+                }
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+    
     def _identify_service(self, port: int, ip: str) -> str:
         """Identify the service based on port."""
         if port in self.WELL_KNOWN_PORTS:
@@ -168,22 +254,21 @@ class NetworkDiscovery:
             self._hostname_cache[ip] = ip
             return ip
         
-        # Validate IP address format and handle IPv6
+        # Validate IP address format
         try:
             parsed_ip = ipaddress.ip_address(ip)
-            
-            # Skip IPv6 addresses that might cause issues
-            if isinstance(parsed_ip, ipaddress.IPv6Address):
-                # For IPv6, check if it's a link-local, loopback, or multicast address
-                if parsed_ip.is_link_local or parsed_ip.is_loopback or parsed_ip.is_multicast:
-                    self._hostname_cache[ip] = ip
-                    return ip
-                # Skip IPv6 resolution if IPv6 is not properly configured (will be caught by OSError)
         except ValueError:
             # Not a valid IP address, return as-is
             self._hostname_cache[ip] = ip
             return ip
         
+        # Only public addresses are worth a reverse lookup. Private (RFC1918),
+        # CGNAT, link-local, loopback and multicast space rarely has PTR records
+        # and would otherwise stall on a full DNS timeout.
+        if not parsed_ip.is_global or parsed_ip.is_multicast:
+            self._hostname_cache[ip] = ip
+            return ip
+        
         try:
             hostname = socket.gethostbyaddr(ip)[0]
             self._hostname_cache[ip] = hostname
@@ -200,16 +285,20 @@ class NetworkDiscovery:
     
     def _determine_direction(self, conn) -> str:
         """Determine if connection is inbound or outbound."""
+        bitmap = self._WELL_KNOWN_BITMAP
+        local_port = conn.laddr.port
+        remote_port = conn.raddr.port
+        
         # If local port is well-known or lower, likely inbound
-        if conn.laddr.port in self.WELL_KNOWN_PORTS:
+        if _port_in(bitmap, local_port):
             return "inbound"
         
         # If remote port is well-known, likely outbound
-        if conn.raddr.port in self.WELL_KNOWN_PORTS:
+        if _port_in(bitmap, remote_port):
             return "outbound"
         
         # If local port is lower, likely inbound (server)
-        if conn.laddr.port < conn.raddr.port:
+        if local_port < remote_port:
             return "inbound"
         
         return "outbound"
@@ -219,13 +308,13 @@ class NetworkDiscovery:
         dependencies: Dict[str, Set[str]] = {}
         
         for conn in self._connections:
-            local = conn["local_process"]
-            remote = conn["remote_service"]
+            local = conn.local_process
+            remote = conn.remote_service
             
             if remote and remote != "unknown" and remote != "ephemeral":
                 if local not in dependencies:
                     dependencies[local] = set()
-                dependencies[local].add(f"{remote}:{conn['remote_addr']}")
+                dependencies[local].add(f"{remote}:{conn.remote_addr}")
         
         return {k: list(v) for k, v in dependencies.items()}
     
@@ -235,16 +324,16 @@ class NetworkDiscovery:
         seen_edges: Set[Tuple] = set()
         
         for conn in self._connections:
-            if conn["direction"] == "outbound":
-                edge_key = (conn["local_process"], conn["remote_service"], conn["remote_port"])
+            if conn.direction == "outbound":
+                edge_key = (conn.local_process, conn.remote_service, conn.remote_port)
                 
                 if edge_key not in seen_edges:
                     seen_edges.add(edge_key)
                     edges.append({
-                        "source": conn["local_process"],
-                        "target": f"{conn['remote_service']}:{conn['remote_addr']}",
-                        "port": conn["remote_port"],
-                        "protocol": conn["protocol"],
+                        "source": conn.local_process,
+                        "target": f"{conn.remote_service}:{conn.remote_addr}",
+                        "port": conn.remote_port,
+                        "protocol": conn.protocol,
                     })
         
         return edges
@@ -1,10 +1,16 @@
 """Process discovery for auto-detecting services and technologies."""
 
+import asyncio
+import functools
 import logging
+import os
 import re
-from datetime import datetime
+import socket
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple
 
 import psutil
 
@@ -12,6 +18,253 @@ from agent.config import AgentConfig
 
 logger = logging.getLogger(__name__)
 
+_HAS_PROCFS = os.path.isdir("/proc/self")
+
+
+def _available_cpus() -> int:
+    """CPUs this process may run on (respects affinity / cpusets)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # Not available on macOS / Windows
+        return os.cpu_count() or 1
+
+
+# Max processes analyzed concurrently in worker threads
+_ANALYSIS_CONCURRENCY = min(_available_cpus(), 16)
+
+# Socket states as encoded in /proc/net/tcp{,6}
+_TCP_STATES = {
+    "01": "ESTABLISHED",
+    "02": "SYN_SENT",
+    "03": "SYN_RECV",
+    "04": "FIN_WAIT1",
+    "05": "FIN_WAIT2",
+    "06": "TIME_WAIT",
+    "07": "CLOSE",
+    "08": "CLOSE_WAIT",
+    "09": "LAST_ACK",
+    "0A": "LISTEN",
+    "0B": "CLOSING",
+}
+
+
+class _Addr(NamedTuple):
+    ip: str
+    port: int
+
+
+class _SocketEntry(NamedTuple):
+    """A socket from the /proc/net tables, shaped like psutil's connection tuples."""
+    laddr: _Addr
+    raddr: Optional[_Addr]
+    status: str
+
+
+def _parse_proc_addr(value: str, family: int) -> _Addr:
+    """Parse a hex "ADDR:PORT" field from /proc/net/tcp{,6}."""
+    addr_hex, port_hex = value.split(":")
+    raw = bytes.fromhex(addr_hex)
+    if family == socket.AF_INET:
+        raw = raw[::-1]
+    else:
+        # IPv6 is four host-order 32-bit words
+        raw = b"".join(raw[i:i + 4][::-1] for i in range(0, 16, 4))
+    return _Addr(socket.inet_ntop(family, raw), int(port_hex, 16))
+
+
+@functools.lru_cache(maxsize=2048)
+def _format_create_time(create_time: float) -> str:
+    """Format a process start time; stable per PID, so memoized across cycles."""
+    # UTC, matching discovered_at; skips datetime construction and tz handling
+    return time.strftime("%Y-%m-%dT%H:%M:%S+00:00", time.gmtime(create_time))
+
+
+def _build_socket_index() -> Optional[Dict[int, _SocketEntry]]:
+    """
+    Parse the TCP socket tables once into an inode -> socket map.
+    
+    Returns None where procfs is unavailable.
+    """
+    if not _HAS_PROCFS:
+        return None
+    
+    index: Dict[int, _SocketEntry] = {}
+    for path, family in (("/proc/net/tcp", socket.AF_INET), ("/proc/net/tcp6", socket.AF_INET6)):
+        try:
+            with open(path) as f:
+                next(f, None)  # Header
+                for line in f:
+                    fields = line.split()
+                    inode = int(fields[9])
+                    if not inode:
+                        continue
+                    raddr = _parse_proc_addr(fields[2], family)
+                    index[inode] = _SocketEntry(
+                        laddr=_parse_proc_addr(fields[1], family),
+                        raddr=raddr if raddr.port else None,
+                        status=_TCP_STATES.get(fields[3], "NONE"),
+                    )
+        except FileNotFoundError:
+            # tcp6 is absent on hosts without IPv6
+            continue
+    return index
+
+
+def _compile_alternation(patterns: List[str]) -> Optional[re.Pattern]:
+    """Combine a list of regex patterns into one case-insensitive alternation."""
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+
+
+@dataclass(frozen=True, slots=True)
+class TechSpec:
+    """Precompiled detection data for one technology."""
+    process_names: Tuple[str, ...]
+    cmdline_re: Optional[re.Pattern]
+    frameworks: Tuple[Tuple[str, re.Pattern], ...]
+
+
+@dataclass(frozen=True, slots=True)
+class ServiceSpec:
+    """Precompiled detection data for one service type."""
+    process_names: Tuple[str, ...]
+    ports: FrozenSet[int]
+
+
+def _build_tech_specs(technology_patterns: Dict[str, Dict[str, Any]]) -> Dict[str, TechSpec]:
+    """Compile cmdline and framework patterns for every technology."""
+    return {
+        tech: TechSpec(
+            process_names=tuple(pn.lower() for pn in patterns.get("process_names", [])),
+            cmdline_re=_compile_alternation(patterns.get("cmdline_patterns", [])),
+            frameworks=tuple(
+                (framework, _compile_alternation(fw_patterns))
+                for framework, fw_patterns in patterns.get("frameworks", {}).items()
+            ),
+        )
+        for tech, patterns in technology_patterns.items()
+    }
+
+
+def _build_service_specs(service_patterns: Dict[str, Dict[str, Any]]) -> Dict[str, ServiceSpec]:
+    """Freeze process names and ports for every service type."""
+    return {
+        service_type: ServiceSpec(
+            process_names=tuple(pn.lower() for pn in config["process_names"]),
+            ports=frozenset(config["ports"]),
+        )
+        for service_type, config in service_patterns.items()
+    }
+
+
+# Technology detection patterns
+TECHNOLOGY_PATTERNS = {
+    "java": {
+        "cmdline_patterns": [r"java\s", r"\.jar\b"],
+        "process_names": ["java", "java.exe"],
+        "frameworks": {
+            "spring": [r"spring", r"org\.springframework"],
+            "tomcat": [r"catalina", r"tomcat"],
+            "wildfly": [r"wildfly", r"jboss"],
+            "jetty": [r"jetty"],
+        },
+    },
+    "nodejs": {
+        "cmdline_patterns": [r"node\s", r"nodejs\s", r"npm\s"],
+        "process_names": ["node", "node.exe", "nodejs"],
+        "frameworks": {
+            "express": [r"express"],
+            "nestjs": [r"@nestjs"],
+            "fastify": [r"fastify"],
+            "nextjs": [r"next"],
+        },
+    },
+    "python": {
+        "cmdline_patterns": [r"python\s", r"python3\s", r"\.py\b"],
+        "process_names": ["python", "python3", "python.exe"],
+        "frameworks": {
+            "django": [r"django", r"manage\.py"],
+            "flask": [r"flask"],
+            "fastapi": [r"fastapi", r"uvicorn"],
+            "celery": [r"celery"],
+        },
+    },
+    "go": {
+        "cmdline_patterns": [],  # Go binaries are compiled
+        "process_names": [],
+        "detection_method": "elf_check",
+    },
+    "dotnet": {
+        "cmdline_patterns": [r"dotnet\s", r"\.dll\b"],
+        "process_names": ["dotnet", "dotnet.exe"],
+        "frameworks": {
+            "aspnet": [r"Microsoft\.AspNetCore"],
+        },
+    },
+    "ruby": {
+        "cmdline_patterns": [r"ruby\s", r"\.rb\b", r"rails\s"],
+        "process_names": ["ruby", "ruby.exe"],
+        "frameworks": {
+            "rails": [r"rails"],
+            "sinatra": [r"sinatra"],
+        },
+    },
+    "php": {
+        "cmdline_patterns": [r"php\s", r"php-fpm"],
+        "process_names": ["php", "php-fpm", "php.exe"],
+        "frameworks": {
+            "laravel": [r"laravel", r"artisan"],
+            "symfony": [r"symfony"],
+        },
+    },
+}
+
+# Service type detection
+SERVICE_PATTERNS = {
+    "web_server": {
+        "process_names": ["nginx", "apache2", "httpd", "caddy", "haproxy"],
+        "ports": [80, 443, 8080, 8443],
+    },
+    "database": {
+        "process_names": ["postgres", "mysqld", "mongod", "redis-server", "cassandra"],
+        "ports": [5432, 3306, 27017, 6379, 9042],
+    },
+    "message_queue": {
+        "process_names": ["rabbitmq", "kafka", "nats-server"],
+        "ports": [5672, 9092, 4222],
+    },
+    "cache": {
+        "process_names": ["redis-server", "memcached"],
+        "ports": [6379, 11211],
+    },
+    "search": {
+        "process_names": ["elasticsearch", "solr"],
+        "ports": [9200, 8983],
+    },
+}
+
+
+def _build_name_index(specs: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Map exact process names to their technology / service type for the
+    detection fast path. The first entry listing a name wins, matching scan order.
+    """
+    index: Dict[str, str] = {}
+    for key, spec in specs.items():
+        for process_name in spec.process_names:
+            index.setdefault(process_name, key)
+    return index
+
+
+# Compiled once at import and shared by every ProcessDiscovery instance; one
+# combined scanner per technology / framework so each cmdline is searched once
+# per technology
+_TECH_SPECS = _build_tech_specs(TECHNOLOGY_PATTERNS)
+_SERVICE_SPECS = _build_service_specs(SERVICE_PATTERNS)
+_NAME_TO_TECH = _build_name_index(_TECH_SPECS)
+_NAME_TO_SERVICE = _build_name_index(_SERVICE_SPECS)
+
 
 class ProcessDiscovery:
     """
@@ -25,114 +278,70 @@ class ProcessDiscovery:
     This enables Dynatrace-like auto-discovery without manual configuration.
     """
     
-    # Technology detection patterns
-    TECHNOLOGY_PATTERNS = {
-        "java": {
-            "cmdline_patterns": [r"java\s", r"\.jar\b"],
-            "process_names": ["java", "java.exe"],
-            "frameworks": {
-                "spring": [r"spring", r"org\.springframework"],
-                "tomcat": [r"catalina", r"tomcat"],
-                "wildfly": [r"wildfly", r"jboss"],
-                "jetty": [r"jetty"],
-            },
-        },
-        "nodejs": {
-            "cmdline_patterns": [r"node\s", r"nodejs\s", r"npm\s"],
-            "process_names": ["node", "node.exe", "nodejs"],
-            "frameworks": {
-                "express": [r"express"],
-                "nestjs": [r"@nestjs"],
-                "fastify": [r"fastify"],
-                "nextjs": [r"next"],
-            },
-        },
-        "python": {
-            "cmdline_patterns": [r"python\s", r"python3\s", r"\.py\b"],
-            "process_names": ["python", "python3", "python.exe"],
-            "frameworks": {
-                "django": [r"django", r"manage\.py"],
-                "flask": [r"flask"],
-                "fastapi": [r"fastapi", r"uvicorn"],
-                "celery": [r"celery"],
-            },
-        },
-        "go": {
-            "cmdline_patterns": [],  # Go binaries are compiled
-            "process_names": [],
-            "detection_method": "elf_check",
-        },
-        "dotnet": {
-            "cmdline_patterns": [r"dotnet\s", r"\.dll\b"],
-            "process_names": ["dotnet", "dotnet.exe"],
-            "frameworks": {
-                "aspnet": [r"Microsoft\.AspNetCore"],
-            },
-        },
-        "ruby": {
-            "cmdline_patterns": [r"ruby\s", r"\.rb\b", r"rails\s"],
-            "process_names": ["ruby", "ruby.exe"],
-            "frameworks": {
-                "rails": [r"rails"],
-                "sinatra": [r"sinatra"],
-            },
-        },
-        "php": {
-            "cmdline_patterns": [r"php\s", r"php-fpm"],
-            "process_names": ["php", "php-fpm", "php.exe"],
-            "frameworks": {
-                "laravel": [r"laravel", r"artisan"],
-                "symfony": [r"symfony"],
-            },
-        },
-    }
-    
-    # Service type detection
-    SERVICE_PATTERNS = {
-        "web_server": {
-            "process_names": ["nginx", "apache2", "httpd", "caddy", "haproxy"],
-            "ports": [80, 443, 8080, 8443],
-        },
-        "database": {
-            "process_names": ["postgres", "mysqld", "mongod", "redis-server", "cassandra"],
-            "ports": [5432, 3306, 27017, 6379, 9042],
-        },
-        "message_queue": {
-            "process_names": ["rabbitmq", "kafka", "nats-server"],
-            "ports": [5672, 9092, 4222],
-        },
-        "cache": {
-            "process_names": ["redis-server", "memcached"],
-            "ports": [6379, 11211],
-        },
-        "search": {
-            "process_names": ["elasticsearch", "solr"],
-            "ports": [9200, 8983],
-        },
-    }
+    # Detection tables (shared module-level data)
+    TECHNOLOGY_PATTERNS = TECHNOLOGY_PATTERNS
+    SERVICE_PATTERNS = SERVICE_PATTERNS
     
     def __init__(self, config: AgentConfig):
         self.config = config
-        self._exclude_patterns = [
-            re.compile(p) for p in config.process_exclude_patterns
-        ]
+        # All exclude patterns folded into one alternation
+        self._exclude_re = (
+            re.compile("|".join(f"(?:{p})" for p in config.process_exclude_patterns))
+            if config.process_exclude_patterns else None
+        )
+        
+        # Many processes (workers, forks) share a cmdline, and it stays stable
+        # across cycles, so memoize technology/framework detection
+        self._detect_stack = functools.lru_cache(maxsize=4096)(self._detect_stack_uncached)
+        
+        # inode -> socket map, rebuilt once per discover() call
+        self._socket_index: Optional[Dict[int, _SocketEntry]] = None
     
     async def discover(self) -> List[Dict[str, Any]]:
         """Discover all processes and their metadata."""
         processes = []
         
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline', 'username', 'create_time']):
+        # Read the socket tables once instead of once per process
+        self._socket_index = _build_socket_index()
+        
+        procs = list(psutil.process_iter(['pid', 'name', 'cmdline', 'username', 'create_time']))
+        
+        # Prime CPU counters for every process, then sample them all after one
+        # shared window instead of blocking 100ms per process
+        for proc in procs:
             try:
-                proc_info = self._analyze_process(proc)
-                if proc_info and not self._should_exclude(proc_info):
-                    processes.append(proc_info)
+                proc.cpu_percent(None)
             except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                pass
+        await asyncio.sleep(0.1)
+        
+        # One timestamp for the whole cycle
+        discovered_at = datetime.now(timezone.utc).isoformat()
+        
+        # Analysis is dominated by /proc reads, which release the GIL, so
+        # overlap them in worker threads
+        semaphore = asyncio.Semaphore(_ANALYSIS_CONCURRENCY)
+        
+        async def analyze(proc: psutil.Process) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await asyncio.to_thread(self._analyze_process, proc, discovered_at)
+        
+        results = await asyncio.gather(
+            *(analyze(proc) for proc in procs),
+            return_exceptions=True,
+        )
+        
+        for proc_info in results:
+            if isinstance(proc_info, BaseException):
+                # NoSuchProcess / AccessDenied / ZombieProcess
                 continue
+            if proc_info and not self._should_exclude(proc_info):
+                processes.append(proc_info)
         
         logger.info(f"Discovered {len(processes)} processes")
         return processes
     
-    def _analyze_process(self, proc: psutil.Process) -> Optional[Dict[str, Any]]:
+    def _analyze_process(self, proc: psutil.Process, discovered_at: str) -> Optional[Dict[str, Any]]:
         """Analyze a single process."""
         try:
             info = proc.info
@@ -141,25 +350,29 @@ class ProcessDiscovery:
             cmdline = info['cmdline'] or []
             cmdline_str = ' '.join(cmdline)
             
-            # Detect technology
-            technology = self._detect_technology(name, cmdline_str)
+            # Patterns are case-insensitive / pre-lowercased; only the short
+            # name is lowercased, once
+            name_lower = name.lower()
             
-            # Detect framework
-            framework = self._detect_framework(technology, cmdline_str)
+            # Detect technology and framework
+            technology, framework = self._detect_stack(name_lower, cmdline_str)
             
-            # Detect service type
-            service_type = self._detect_service_type(name, proc)
-            
-            # Get listening ports
-            listening_ports = self._get_listening_ports(proc)
+            # Fetch sockets once for port, topology and service detection
+            try:
+                conns = self._get_proc_connections(proc)
+            except (psutil.AccessDenied, psutil.NoSuchProcess):
+                conns = []
+            listening_ports, connections = self._partition_connections(conns)
             
-            # Get connections (for topology)
-            connections = self._get_connections(proc)
+            # Detect service type
+            service_type = self._detect_service_type(name_lower, listening_ports)
             
-            # Get memory and CPU
+            # Get memory and CPU; oneshot lets psutil share /proc reads
+            # between the two calls
             try:
-                memory_info = proc.memory_info()
-                cpu_percent = proc.cpu_percent(interval=0.1)
+                with proc.oneshot():
+                    memory_info = proc.memory_info()
+                    cpu_percent = proc.cpu_percent(None)
             except Exception:
                 memory_info = None
                 cpu_percent = 0
@@ -176,28 +389,33 @@ class ProcessDiscovery:
                 "connections": connections,
                 "memory_rss": memory_info.rss if memory_info else 0,
                 "cpu_percent": cpu_percent,
-                "create_time": datetime.fromtimestamp(info['create_time']).isoformat() if info['create_time'] else None,
-                "discovered_at": datetime.utcnow().isoformat(),
+                "create_time": _format_create_time(info['create_time']) if info['create_time'] else None,
+                "discovered_at": discovered_at,
             }
         
         except Exception as e:
             logger.debug(f"Error analyzing process: {e}")
             return None
     
-    def _detect_technology(self, name: str, cmdline: str) -> Optional[str]:
-        """Detect the technology/runtime of a process."""
-        name_lower = name.lower()
-        cmdline_lower = cmdline.lower()
+    def _detect_stack_uncached(self, name_lower: str, cmdline: str) -> Tuple[Optional[str], Optional[str]]:
+        """Detect technology and framework for a lowercased process name and cmdline."""
+        technology = self._detect_technology(name_lower, cmdline)
+        return technology, self._detect_framework(technology, cmdline)
+    
+    def _detect_technology(self, name_lower: str, cmdline: str) -> Optional[str]:
+        """Detect the technology/runtime of a process (name must be lowercased)."""
+        tech = _NAME_TO_TECH.get(name_lower)
+        if tech is not None:
+            return tech
         
-        for tech, patterns in self.TECHNOLOGY_PATTERNS.items():
+        for tech, spec in _TECH_SPECS.items():
             # Check process name
-            if any(pn in name_lower for pn in patterns.get("process_names", [])):
+            if any(pn in name_lower for pn in spec.process_names):
                 return tech
             
             # Check command line
-            for pattern in patterns.get("cmdline_patterns", []):
-                if re.search(pattern, cmdline_lower):
-                    return tech
+            if spec.cmdline_re is not None and spec.cmdline_re.search(cmdline):
+                return tech
         
         return None
     
@@ -206,68 +424,77 @@ class ProcessDiscovery:
         if not technology:
             return None
         
-        cmdline_lower = cmdline.lower()
-        tech_patterns = self.TECHNOLOGY_PATTERNS.get(technology, {})
-        frameworks = tech_patterns.get("frameworks", {})
+        spec = _TECH_SPECS.get(technology)
+        if spec is None:
+            return None
         
-        for framework, patterns in frameworks.items():
-            for pattern in patterns:
-                if re.search(pattern, cmdline_lower):
-                    return framework
+        for framework, framework_re in spec.frameworks:
+            if framework_re.search(cmdline):
+                return framework
         
         return None
     
-    def _detect_service_type(self, name: str, proc: psutil.Process) -> Optional[str]:
-        """Detect the type of service."""
-        name_lower = name.lower()
+    def _detect_service_type(self, name_lower: str, listening_ports: List[int]) -> Optional[str]:
+        """Detect the type of service (name must be lowercased)."""
+        service_type = _NAME_TO_SERVICE.get(name_lower)
+        if service_type is not None:
+            return service_type
         
-        for service_type, config in self.SERVICE_PATTERNS.items():
+        for service_type, spec in _SERVICE_SPECS.items():
             # Check process name
-            if any(pn in name_lower for pn in config["process_names"]):
+            if any(pn in name_lower for pn in spec.process_names):
                 return service_type
             
             # Check listening ports
-            try:
-                for conn in proc.connections(kind="inet"):
-                    if conn.status == "LISTEN" and conn.laddr.port in config["ports"]:
-                        return service_type
-            except (psutil.AccessDenied, psutil.NoSuchProcess):
-                pass
+            if not spec.ports.isdisjoint(listening_ports):
+                return service_type
         
         return "application"  # Default
     
-    def _get_listening_ports(self, proc: psutil.Process) -> List[int]:
-        """Get ports the process is listening on."""
-        ports = []
+    def _get_proc_connections(self, proc: psutil.Process) -> List[Any]:
+        """Get a process's TCP sockets from the prebuilt socket index."""
+        if self._socket_index is None:
+            return proc.connections(kind="inet")
+        
+        connections = []
         try:
-            for conn in proc.connections(kind="inet"):
-                if conn.status == "LISTEN":
-                    ports.append(conn.laddr.port)
-        except (psutil.AccessDenied, psutil.NoSuchProcess):
-            pass
-        return sorted(set(ports))
+            with os.scandir(f"/proc/{proc.pid}/fd") as fds:
+                for fd in fds:
+                    try:
+                        target = os.readlink(fd.path)
+                    except OSError:
+                        continue
+                    if target.startswith("socket:["):
+                        entry = self._socket_index.get(int(target[8:-1]))
+                        if entry is not None:
+                            connections.append(entry)
+        except FileNotFoundError:
+            raise psutil.NoSuchProcess(proc.pid)
+        except PermissionError:
+            raise psutil.AccessDenied(proc.pid)
+        return connections
     
-    def _get_connections(self, proc: psutil.Process) -> List[Dict[str, Any]]:
-        """Get outgoing connections for topology mapping."""
+    def _partition_connections(self, conns: List[Any]) -> Tuple[List[int], List[Dict[str, Any]]]:
+        """
+        Split a process's sockets in one pass into listening ports and
+        established outgoing connections (for topology mapping).
+        """
+        ports = set()
         connections = []
-        try:
-            for conn in proc.connections(kind="inet"):
-                if conn.status == "ESTABLISHED" and conn.raddr:
-                    connections.append({
-                        "local_port": conn.laddr.port,
-                        "remote_addr": conn.raddr.ip,
-                        "remote_port": conn.raddr.port,
-                    })
-        except (psutil.AccessDenied, psutil.NoSuchProcess):
-            pass
-        return connections[:50]  # Limit
+        for conn in conns:
+            if conn.status == "LISTEN":
+                ports.add(conn.laddr.port)
+            elif conn.status == "ESTABLISHED" and conn.raddr and len(connections) < 50:  # Limit
+                connections.append({
+                    "local_port": conn.laddr.port,
+                    "remote_addr": conn.raddr.ip,
+                    "remote_port": conn.raddr.port,
+                })
+        return sorted(ports), connections
     
     def _should_exclude(self, proc_info: Dict[str, Any]) -> bool:
         """Check if process should be excluded."""
-        name = proc_info.get("name", "")
-        
-        for pattern in self._exclude_patterns:
-            if pattern.match(name):
-                return True
+        if self._exclude_re is None:
+            return False
         
-        return False
+        return self._exclude_re.match(proc_info.get("name", "")) is not None
@@ -1,20 +1,100 @@
 """Data exporter for sending collected data to the platform."""
 
 import asyncio
-import gzip
+import hashlib
 import json
 import logging
+import random
 import socket
-from datetime import datetime, timedelta
+import threading
+import time
+import zlib
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
 
 import aiohttp
 
-from agent.buffer import DataBuffer, BufferedData
+from agent.buffer import DataBuffer, BufferedData, MAX_ATTEMPTS
+
+try:
+    import orjson
+except ImportError:  # Optional dependency, fall back to stdlib json
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency, fall back to gzip
+    zstandard = None
+
+try:
+    from isal import isal_zlib
+except ImportError:  # Optional dependency, fall back to stdlib zlib
+    isal_zlib = None
 
 logger = logging.getLogger(__name__)
 
+# Slice size when streaming serialized JSON into the compressor
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+# Bodies smaller than this are sent uncompressed: the codec framing and
+# CPU cost outweigh the bytes saved
+_COMPRESS_THRESHOLD = 1024
+
+# Items from failed batches held in memory for retry before falling back to
+# the buffer (which enforces its own size and spill limits)
+_RETRY_QUEUE_MAX_ITEMS = 10_000
+
+# Adaptive flush cadence: batches filled past the high mark speed up the
+# next flush, batches below the low mark slow it down
+_FILL_HIGH_WATERMARK = 0.8
+_FILL_LOW_WATERMARK = 0.1
+
+# Default ceiling for the idle-stretched flush interval
+_DEFAULT_MAX_FLUSH_INTERVAL = 60.0
+
+# Adaptive batch sizing: aim for ~1MB compressed per request
+_TARGET_REQUEST_BYTES = 1_000_000
+_MIN_BATCH_SIZE = 100
+_MAX_BATCH_SIZE = 10_000
+
+# Exceptions that mean the endpoint's hostname didn't resolve. aiohttp 3.10+
+# raises a dedicated ClientConnectorDNSError; older versions chain gaierror.
+_DNS_ERROR_TYPES: Tuple[type, ...] = (socket.gaierror,)
+if hasattr(aiohttp, "ClientConnectorDNSError"):
+    _DNS_ERROR_TYPES += (aiohttp.ClientConnectorDNSError,)
+
+
+def _is_dns_error(exc: BaseException) -> bool:
+    """Whether an exception, or anything in its cause chain, is a DNS failure."""
+    seen = set()
+    cur: Optional[BaseException] = exc
+    while cur is not None and id(cur) not in seen:
+        if isinstance(cur, _DNS_ERROR_TYPES):
+            return True
+        seen.add(id(cur))
+        cur = cur.__cause__ or cur.__context__
+    return False
+
+
+def _parse_retry_after(value: Optional[str], default: float = 60.0) -> float:
+    """Seconds to wait per a Retry-After header: delay-seconds or an HTTP-date."""
+    if value is None:
+        return default
+    try:
+        return max(0, int(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
 
 class CircuitState(Enum):
     """Circuit breaker states."""
@@ -29,7 +109,7 @@ class DataExporter:
     
     Features:
     - Batched exports for efficiency
-    - Compression (gzip)
+    - Compression (gzip, or zstd for endpoints that accept it)
     - Automatic retry with exponential backoff
     - Connection pooling
     """
@@ -47,27 +127,68 @@ class DataExporter:
         max_retry_delay: float = 60.0,
         circuit_breaker_threshold: int = 5,
         circuit_breaker_timeout: float = 300.0,  # 5 minutes
+        compression: str = "gzip",  # "gzip" or "zstd" (endpoint must accept zstd)
+        min_flush_interval: float = 0.5,
+        max_flush_interval: Optional[float] = None,
     ):
         self.endpoint = endpoint.rstrip("/")
         self.api_key = api_key
         self.tenant_id = tenant_id
         self.buffer = buffer
         self.batch_size = batch_size
+        # Batch fill is judged against the configured size; batch_size itself
+        # adapts to payload size and can grow far beyond it
+        self._configured_batch_size = batch_size
         self.flush_interval = flush_interval
+        self.min_flush_interval = min_flush_interval
+        # Idle backoff stretches the interval up to this ceiling; by default
+        # 60s, or the configured interval if that is already longer
+        self.max_flush_interval = (
+            max_flush_interval if max_flush_interval is not None
+            else max(flush_interval, _DEFAULT_MAX_FLUSH_INTERVAL)
+        )
+        self._current_interval = flush_interval
         self.max_retries = max_retries
         self.initial_retry_delay = initial_retry_delay
         self.max_retry_delay = max_retry_delay
         self.circuit_breaker_threshold = circuit_breaker_threshold
         self.circuit_breaker_timeout = circuit_breaker_timeout
         
+        if compression == "zstd" and zstandard is None:
+            logger.warning("zstandard not installed, falling back to gzip compression")
+            compression = "gzip"
+        self.compression = compression
+        # zstd compressors are not thread-safe; each executor thread gets its own
+        self._zstd_local = threading.local()
+        
+        # Ingest URLs per data type, resolved once rather than on every send
+        self._url_by_type = {
+            "metrics": f"{self.endpoint}/metrics",
+            "logs": f"{self.endpoint}/logs",
+            "traces": f"{self.endpoint}/traces",
+            "topology": f"{self.endpoint.replace('/api/v1/ingest', '/api/v2/topology')}/ingest",
+        }
+        # Metrics and logs are wrapped in an object keyed by type; traces and
+        # topology endpoints expect the array directly
+        self._body_key_by_type = {"metrics": "metrics", "logs": "logs"}
+        
         self._session: Optional[aiohttp.ClientSession] = None
         self._running = False
         
+        # (url, body digest) -> outcome of the request currently sending that
+        # body; the event loop is single-threaded, so check-and-add needs no lock
+        self._inflight: Dict[Tuple[str, bytes], asyncio.Future] = {}
+        
+        # Failed batches, retried on the next flush without a buffer round-trip
+        self._retry_queue: Deque[Tuple[str, List[BufferedData]]] = deque()
+        self._retry_queue_items = 0
+        
         # Circuit breaker state
         self._circuit_state = CircuitState.CLOSED
         self._failure_count = 0
-        self._circuit_open_until: Optional[datetime] = None
-        self._last_success_time: Optional[datetime] = None
+        # Monotonic deadlines: immune to wall-clock jumps
+        self._circuit_open_until_mono: Optional[float] = None
+        self._last_success_mono: Optional[float] = None
         self._dns_failures = 0
         
         # Extract hostname for DNS checks
@@ -78,14 +199,14 @@ class DataExporter:
         except Exception:
             self._hostname = None
         
-        self._stats = {
-            "bytes_sent": 0,
-            "requests_made": 0,
-            "requests_failed": 0,
-            "items_sent": 0,
-            "circuit_breaker_opens": 0,
-            "dns_failures": 0,
-        }
+        # Counters live in plain attributes; get_stats() builds the dict
+        self._bytes_sent = 0
+        self._requests_made = 0
+        self._requests_failed = 0
+        self._items_sent = 0
+        self._circuit_breaker_opens = 0
+        self._dns_failures_total = 0
+        self._avg_bytes_per_item = 0.0
     
     async def start(self):
         """Start the exporter."""
@@ -105,31 +226,56 @@ class DataExporter:
                 "X-API-Key": self.api_key,
                 "X-Tenant-ID": self.tenant_id,
                 "Content-Type": "application/json",
-                "Content-Encoding": "gzip",
                 "User-Agent": "DevopsMate-Agent/0.1.0",
             },
             timeout=aiohttp.ClientTimeout(total=30),
+            # Keep connections alive across flush intervals to avoid
+            # re-paying TCP/TLS setup every flush. All traffic goes to one
+            # ingest host, so the per-host limit is the effective pool size.
+            connector=aiohttp.TCPConnector(
+                limit=16,
+                limit_per_host=16,
+                keepalive_timeout=75,
+                enable_cleanup_closed=True,
+                use_dns_cache=True,
+                ttl_dns_cache=300,
+            ),
         )
         
         # Recover any spilled data (limited batch to avoid memory spike)
         await self.buffer.recover_from_disk(max_files=10)
         
         # Start flush loop
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
         while self._running:
             try:
                 await self._flush_all()
             except Exception as e:
-                logger.error(f"Flush error: {e}", exc_info=True)
                 # Don't let one error stop the exporter
-                await asyncio.sleep(self.flush_interval)
+                logger.error(f"Flush error: {e}", exc_info=True)
             
-            await asyncio.sleep(self.flush_interval)
+            # Ticks are scheduled from the previous deadline so time spent
+            # flushing doesn't stretch the cadence; if a flush overran a
+            # whole interval, restart from now rather than bursting
+            next_tick += self._current_interval
+            now = loop.time()
+            if next_tick < now:
+                next_tick = now
+            await asyncio.sleep(next_tick - now)
     
     async def stop(self):
         """Stop the exporter."""
         self._running = False
         await self.flush()
         
+        # Hand anything still pending back to the buffer. Queued items had
+        # their failed attempt counted when they were queued.
+        while self._retry_queue:
+            _, batch = self._retry_queue.popleft()
+            self._retry_queue_items -= len(batch)
+            await self.buffer.return_failed(batch, count_attempt=False)
+        
         if self._session:
             await self._session.close()
     
@@ -141,7 +287,7 @@ class DataExporter:
         """Flush all data types."""
         # Check circuit breaker
         if self._circuit_state == CircuitState.OPEN:
-            if self._circuit_open_until and datetime.utcnow() < self._circuit_open_until:
+            if self._circuit_open_until_mono and time.monotonic() < self._circuit_open_until_mono:
                 logger.debug("Circuit breaker open, skipping flush")
                 return
             else:
@@ -150,32 +296,98 @@ class DataExporter:
                 self._circuit_state = CircuitState.HALF_OPEN
                 self._failure_count = 0
         
-        # Recover spilled data in small batches (LIFO - newest first)
-        # Only recover if circuit is not open or in half-open state
-        if self._circuit_state != CircuitState.OPEN:
-            recovered = await self.buffer.recover_from_disk(max_files=5)
-            if recovered > 0:
-                logger.info(f"Recovered {recovered} items from disk, attempting to send...")
+        # Retry previously failed batches before pulling fresh data. They
+        # already went through backoff, so each gets one attempt per flush
+        # and they go out together rather than stalling the loop in turn.
+        retries = []
+        while self._retry_queue:
+            data_type, batch = self._retry_queue.popleft()
+            self._retry_queue_items -= len(batch)
+            retries.append(self._send_batch(data_type, batch, max_attempts=1))
+        if retries:
+            await asyncio.gather(*retries)
         
-        # Then flush current in-memory buffers
-        for data_type in ["metrics", "logs", "traces"]:
-            await self._flush_type(data_type)
+        # Idle fast path: nothing queued in memory or on disk, so skip the
+        # per-type flushes (and their buffer lock round-trips) entirely
+        data_types = ("metrics", "logs", "traces")
+        if not self.buffer.total_pending(data_types) and not self.buffer.has_spilled(data_types):
+            self._adjust_flush_interval(0.0)
+            return
+        
+        # Then flush current in-memory buffers; data types are independent,
+        # so overlap their serialization and HTTP round-trips
+        results = await asyncio.gather(
+            *(self._flush_type(data_type) for data_type in data_types),
+            return_exceptions=True,
+        )
+        fill_ratio = 0.0
+        for data_type, result in zip(data_types, results):
+            if isinstance(result, Exception):
+                logger.error(f"Flush error for {data_type}: {result}")
+            else:
+                fill_ratio = max(fill_ratio, result)
+        
+        self._adjust_flush_interval(fill_ratio)
     
-    async def _flush_type(self, data_type: str):
-        """Flush a specific data type."""
-        batch = await self.buffer.get_batch(data_type, self.batch_size)
+    async def _flush_type(self, data_type: str) -> float:
+        """Flush a specific data type, returning how full the batch was."""
+        batch_size = self.batch_size
+        # Spilled data tops up the batch directly, so recovered items ride
+        # along in the same request instead of waiting for the next cycle
+        batch = await self.buffer.get_batch_combined(data_type, batch_size)
         if not batch:
+            return 0.0
+        
+        await self._send_batch(data_type, batch)
+        return len(batch) / self._configured_batch_size
+    
+    def _adjust_flush_interval(self, fill_ratio: float):
+        """Flush sooner when batches come back full, back off when mostly idle."""
+        if fill_ratio >= _FILL_HIGH_WATERMARK:
+            interval = self._current_interval / 2
+        elif fill_ratio < _FILL_LOW_WATERMARK:
+            interval = self._current_interval * 2
+        else:
             return
         
+        interval = max(self.min_flush_interval, min(interval, self.max_flush_interval))
+        if interval != self._current_interval:
+            logger.debug(
+                f"Flush interval {self._current_interval:.1f}s -> {interval:.1f}s "
+                f"(batch fill {fill_ratio:.0%})"
+            )
+            self._current_interval = interval
+    
+    async def _send_batch(
+        self,
+        data_type: str,
+        batch: List[BufferedData],
+        max_attempts: Optional[int] = None,
+    ):
+        """Send a batch, queueing it for retry on failure."""
         # Prepare payload
         payloads = [item.payload for item in batch]
         
         # Send with retry
-        success = await self._send_with_retry(data_type, payloads)
+        success = await self._send_with_retry(data_type, payloads, max_attempts)
         
         if not success:
-            # Return failed items to buffer
-            await self.buffer.return_failed(batch)
+            if self._retry_queue_items + len(batch) <= _RETRY_QUEUE_MAX_ITEMS:
+                for item in batch:
+                    item.attempts += 1
+                retry = [item for item in batch if item.attempts < MAX_ATTEMPTS]
+                dropped = len(batch) - len(retry)
+                if dropped:
+                    self.buffer.record_dropped(dropped)
+                    logger.warning(
+                        f"Dropped {dropped} {data_type} items after {MAX_ATTEMPTS} failed attempts"
+                    )
+                if retry:
+                    self._retry_queue.append((data_type, retry))
+                    self._retry_queue_items += len(retry)
+            else:
+                # Retry queue full, return failed items to buffer
+                await self.buffer.return_failed(batch)
     
     async def _check_dns(self) -> bool:
         """Check if DNS resolution works for the endpoint."""
@@ -183,12 +395,16 @@ class DataExporter:
             return True  # Can't check, assume OK
         
         try:
-            socket.gethostbyname(self._hostname)
+            # Resolve via the loop's resolver so a slow lookup doesn't block
+            # every other coroutine on the event loop
+            await asyncio.get_running_loop().getaddrinfo(
+                self._hostname, None, type=socket.SOCK_STREAM
+            )
             self._dns_failures = 0
             return True
         except socket.gaierror as e:
             self._dns_failures += 1
-            self._stats["dns_failures"] += 1
+            self._dns_failures_total += 1
             logger.error(f"DNS resolution failure ({self._dns_failures}): {e}")
             
             # Open circuit after 5 consecutive DNS failures
@@ -204,8 +420,8 @@ class DataExporter:
         """Open the circuit breaker."""
         if self._circuit_state != CircuitState.OPEN:
             self._circuit_state = CircuitState.OPEN
-            self._circuit_open_until = datetime.utcnow() + timedelta(seconds=self.circuit_breaker_timeout)
-            self._stats["circuit_breaker_opens"] += 1
+            self._circuit_open_until_mono = time.monotonic() + self.circuit_breaker_timeout
+            self._circuit_breaker_opens += 1
             logger.warning(
                 f"Circuit breaker opened due to: {reason}. "
                 f"Will retry in {self.circuit_breaker_timeout}s"
@@ -215,7 +431,7 @@ class DataExporter:
         """Record a successful request."""
         self._failure_count = 0
         self._dns_failures = 0
-        self._last_success_time = datetime.utcnow()
+        self._last_success_mono = time.monotonic()
         
         if self._circuit_state == CircuitState.HALF_OPEN:
             logger.info("Circuit breaker closed after successful request")
@@ -230,10 +446,9 @@ class DataExporter:
         
         # Check if we should open circuit breaker
         if self._failure_count >= self.circuit_breaker_threshold:
-            error_msg = str(error)
-            if "name resolution" in error_msg.lower() or "dns" in error_msg.lower():
+            if _is_dns_error(error):
                 self._dns_failures += 1
-                self._stats["dns_failures"] += 1
+                self._dns_failures_total += 1
                 if self._dns_failures >= self.circuit_breaker_threshold:
                     self._open_circuit("DNS resolution failures")
             else:
@@ -243,65 +458,111 @@ class DataExporter:
         self,
         data_type: str,
         payloads: List[Dict[str, Any]],
+        max_attempts: Optional[int] = None,
     ) -> bool:
-        """Send data with exponential backoff retry."""
+        """
+        Send data with exponential backoff retry.
+        
+        Makes up to max_attempts requests (default max_retries); there is
+        no backoff sleep after the last one.
+        """
+        attempts = max_attempts or self.max_retries
         # Check if session is initialized
         if not self._session:
             logger.warning(f"Session not initialized, skipping {data_type} export")
             return False
         
-        endpoint_map = {
-            "metrics": f"{self.endpoint}/metrics",
-            "logs": f"{self.endpoint}/logs",
-            "traces": f"{self.endpoint}/traces",
-            "topology": f"{self.endpoint.replace('/api/v1/ingest', '/api/v2/topology')}/ingest",
-        }
-        
-        url = endpoint_map.get(data_type, f"{self.endpoint}/{data_type}")
+        url = self._url_by_type.get(data_type) or f"{self.endpoint}/{data_type}"
         
         # Format payload according to API schema
-        if data_type == "metrics":
-            request_body = {"metrics": payloads}
-        elif data_type == "logs":
-            request_body = {"logs": payloads}
-        elif data_type == "traces":
-            # Traces endpoint expects array directly
-            request_body = payloads
-        else:
-            request_body = payloads
+        body_key = self._body_key_by_type.get(data_type)
+        request_body = {body_key: payloads} if body_key else payloads
+        
+        # Serialize and compress once, off the event loop; retries resend
+        # the same bytes instead of re-encoding the batch every attempt
+        try:
+            compressed, encoding = await asyncio.get_running_loop().run_in_executor(
+                None, self._encode, request_body
+            )
+        except Exception as e:
+            logger.error(f"Failed to encode {data_type} payload: {e}")
+            self._requests_failed += 1
+            return False
+        
+        # Coalesce identical bodies already in flight to the same URL, e.g. a
+        # batch re-queued while its earlier attempt is still retrying. The
+        # duplicate shares the original's outcome, so if that fails its
+        # caller still re-queues the items.
+        inflight_key = (url, hashlib.blake2b(compressed, digest_size=16).digest())
+        pending = self._inflight.get(inflight_key)
+        if pending is not None:
+            logger.debug(f"Identical {data_type} payload already in flight, waiting on it")
+            return await asyncio.shield(pending)
+        outcome = asyncio.get_running_loop().create_future()
+        self._inflight[inflight_key] = outcome
+        
+        success = False
+        try:
+            success = await self._post_with_retry(data_type, url, compressed, encoding, len(payloads), attempts)
+            return success
+        finally:
+            del self._inflight[inflight_key]
+            outcome.set_result(success)
+    
+    async def _post_with_retry(
+        self,
+        data_type: str,
+        url: str,
+        compressed: bytes,
+        encoding: Optional[str],
+        item_count: int,
+        attempts: int,
+    ) -> bool:
+        """POST an encoded body, retrying up to attempts times."""
+        headers = {"Content-Encoding": encoding} if encoding else {}
+        # Wrap once so every attempt writes the same buffer; passing raw
+        # bytes makes aiohttp build a new payload object per request
+        body = aiohttp.BytesPayload(memoryview(compressed), content_type="application/json")
         
-        for attempt in range(self.max_retries):
+        for attempt in range(attempts):
+            final_attempt = attempt + 1 >= attempts
             try:
-                # Compress payload
-                payload_json = json.dumps(request_body)
-                compressed = gzip.compress(payload_json.encode())
-                
-                async with self._session.post(url, data=compressed) as response:
-                    self._stats["requests_made"] += 1
+                async with self._session.post(url, data=body, headers=headers) as response:
+                    self._requests_made += 1
                     
                     if response.status == 200:
-                        self._stats["bytes_sent"] += len(compressed)
-                        self._stats["items_sent"] += len(payloads)
+                        self._bytes_sent += len(compressed)
+                        self._items_sent += item_count
+                        # Bodies under _COMPRESS_THRESHOLD go out raw; their size
+                        # says nothing about compressed bytes per item
+                        if encoding and data_type != "topology":
+                            self._update_batch_size(len(compressed), item_count)
                         self._record_success()
-                        logger.debug(f"Sent {len(payloads)} {data_type} items")
+                        logger.debug(f"Sent {item_count} {data_type} items")
                         return True
                     
                     elif response.status == 429:
                         # Rate limited, wait and retry
-                        retry_after = int(response.headers.get("Retry-After", 60))
-                        logger.warning(f"Rate limited, waiting {retry_after}s")
+                        retry_after = _parse_retry_after(response.headers.get("Retry-After"))
+                        if final_attempt:
+                            logger.warning(f"Rate limited sending {data_type}")
+                            break
+                        logger.warning(f"Rate limited, waiting {retry_after:.0f}s")
                         await asyncio.sleep(retry_after)
                         continue  # Don't count as failure
                     
                     elif response.status >= 500:
                         # Server error, retry with exponential backoff
-                        delay = min(
-                            self.initial_retry_delay * (2 ** attempt),
-                            self.max_retry_delay
-                        )
+                        if final_attempt:
+                            logger.warning(
+                                f"Server error {response.status} for {data_type} "
+                                f"(attempt {attempt + 1}/{attempts})"
+                            )
+                            break
+                        delay = self._backoff(attempt)
                         logger.warning(
                             f"Server error {response.status}, retrying in {delay:.1f}s "
-                            f"(attempt {attempt + 1}/{self.max_retries})"
+                            f"(attempt {attempt + 1}/{attempts})"
                         )
                         await asyncio.sleep(delay)
                         continue  # Retry
@@ -312,61 +573,136 @@ class DataExporter:
                         logger.error(
                             f"Client error {response.status} for {data_type}: {response_text[:500]}"
                         )
-                        self._stats["requests_failed"] += 1
+                        self._requests_failed += 1
                         return False
                         
-            except aiohttp.ClientConnectorError as e:
-                error_msg = str(e).lower()
-                if "name resolution" in error_msg or "dns" in error_msg:
+            except Exception as e:
+                is_dns, retryable = self._classify(e)
+                if is_dns:
                     self._dns_failures += 1
-                    self._stats["dns_failures"] += 1
+                    self._dns_failures_total += 1
                     logger.error(f"DNS resolution failure ({self._dns_failures}): {e}")
                     
                     if self._dns_failures >= self.circuit_breaker_threshold:
                         self._open_circuit("DNS resolution failures")
                         return False
+                elif retryable:
+                    logger.error(f"HTTP client error sending {data_type}: {e}")
                 else:
-                    logger.error(f"Connection error: {e}")
+                    logger.error(f"Unexpected error sending {data_type}: {e}")
                 
                 self._record_failure(e)
-                delay = min(
-                    self.initial_retry_delay * (2 ** attempt),
-                    self.max_retry_delay
-                )
-                await asyncio.sleep(delay)
-            
-            except aiohttp.ClientError as e:
-                logger.error(f"HTTP client error: {e}")
-                self._record_failure(e)
-                delay = min(
-                    self.initial_retry_delay * (2 ** attempt),
-                    self.max_retry_delay
-                )
-                await asyncio.sleep(delay)
-            
-            except Exception as e:
-                logger.error(f"Unexpected error: {e}")
-                self._record_failure(e)
-                delay = min(
-                    self.initial_retry_delay * (2 ** attempt),
-                    self.max_retry_delay
-                )
-                await asyncio.sleep(delay)
+                if not retryable or final_attempt:
+                    break
+                await asyncio.sleep(self._backoff(attempt))
         
-        self._stats["requests_failed"] += 1
+        self._requests_failed += 1
         return False
     
+    @staticmethod
+    def _classify(exc: Exception) -> Tuple[bool, bool]:
+        """Classify a send error as (is_dns_failure, is_retryable)."""
+        is_dns = _is_dns_error(exc)
+        # Transport and timeout errors may clear up; anything else is a bug
+        # in building the request and would fail the same way again
+        retryable = isinstance(exc, (aiohttp.ClientError, asyncio.TimeoutError, OSError))
+        return is_dns, retryable
+    
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter so agents don't retry in lock-step."""
+        return random.uniform(
+            0, min(self.initial_retry_delay * (1 << attempt), self.max_retry_delay)
+        )
+    
+    def _update_batch_size(self, compressed_bytes: int, item_count: int):
+        """Resize batches so each request lands near the target compressed size."""
+        per_item = compressed_bytes / item_count
+        avg = self._avg_bytes_per_item
+        # Exponentially weighted so one odd batch doesn't swing the size
+        avg = per_item if not avg else 0.8 * avg + 0.2 * per_item
+        self._avg_bytes_per_item = avg
+        target = max(
+            _MIN_BATCH_SIZE,
+            min(int(_TARGET_REQUEST_BYTES / avg), _MAX_BATCH_SIZE),
+        )
+        # Step at most 2x either way per sample, so the first few batches
+        # can't throw the size straight to either bound
+        self.batch_size = max(self.batch_size // 2, min(target, self.batch_size * 2))
+    
+    def _encode(self, request_body: Any) -> Tuple[bytes, Optional[str]]:
+        """
+        Serialize and compress a request body (runs in a worker thread).
+        
+        Returns the body and its Content-Encoding, or None if it was small
+        enough to send uncompressed.
+        """
+        if orjson is not None:
+            # orjson emits bytes directly: a single intermediate buffer
+            raw = orjson.dumps(
+                request_body,
+                option=orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+            )
+            if len(raw) < _COMPRESS_THRESHOLD:
+                return raw, None
+            return self._compress([raw]), self.compression
+        
+        # stdlib json yields an ASCII str; feed it to the compressor in slices
+        # instead of materializing a full-size encoded copy
+        text = json.dumps(request_body)
+        if len(text) < _COMPRESS_THRESHOLD:
+            return text.encode(), None
+        return self._compress(
+            text[i:i + _STREAM_CHUNK_SIZE].encode()
+            for i in range(0, len(text), _STREAM_CHUNK_SIZE)
+        ), self.compression
+    
+    def _compress(self, chunks: Iterable[bytes]) -> bytes:
+        """Stream serialized payload chunks through the configured codec."""
+        if self.compression == "zstd":
+            compressor = getattr(self._zstd_local, "compressor", None)
+            if compressor is None:
+                compressor = self._zstd_local.compressor = zstandard.ZstdCompressor(level=3)
+            cobj = compressor.compressobj()
+            parts = [cobj.compress(chunk) for chunk in chunks]
+            parts.append(cobj.flush())
+            return b"".join(parts)
+        
+        # wbits=31 writes the gzip container directly, skipping GzipFile's
+        # BytesIO wrapper and per-write CRC bookkeeping in Python.
+        # ISA-L's SIMD deflate at level 1 is several times faster than zlib
+        # for JSON at a small cost in ratio.
+        if isal_zlib is not None:
+            cobj = isal_zlib.compressobj(1, isal_zlib.DEFLATED, 31)
+        else:
+            cobj = zlib.compressobj(6, zlib.DEFLATED, 31)
+        parts = [cobj.compress(chunk) for chunk in chunks]
+        parts.append(cobj.flush())
+        return b"".join(parts)
+    
     async def send_topology(self, topology: Dict[str, Any]) -> bool:
         """Send topology data immediately."""
         return await self._send_with_retry("topology", [topology])
     
     def get_stats(self) -> Dict[str, Any]:
         """Get exporter statistics."""
-        stats = self._stats.copy()
-        stats.update({
+        circuit_open_until = None
+        if self._circuit_open_until_mono:
+            # Translate the monotonic deadline to wall-clock time for display
+            remaining = self._circuit_open_until_mono - time.monotonic()
+            circuit_open_until = (
+                datetime.now(timezone.utc) + timedelta(seconds=remaining)
+            ).isoformat()
+        return {
+            "bytes_sent": self._bytes_sent,
+            "requests_made": self._requests_made,
+            "requests_failed": self._requests_failed,
+            "items_sent": self._items_sent,
+            "circuit_breaker_opens": self._circuit_breaker_opens,
+            "dns_failures_total": self._dns_failures_total,
+            "avg_compressed_bytes_per_item": self._avg_bytes_per_item,
             "circuit_state": self._circuit_state.value,
             "failure_count": self._failure_count,
             "dns_failures": self._dns_failures,
-            "circuit_open_until": self._circuit_open_until.isoformat() if self._circuit_open_until else None,
-        })
-        return stats
+            "flush_interval": self._current_interval,
+            "circuit_open_until": circuit_open_until,
+        }
@@ -1,6 +1,7 @@
 """Auto-instrumentation orchestrator for multiple languages."""
 
 import asyncio
+import functools
 import logging
 import os
 import subprocess
@@ -8,11 +9,37 @@ import sys
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+import aiohttp
+
 from agent.config import AgentConfig
 
 logger = logging.getLogger(__name__)
 
 
+@functools.cache
+def _python_site_packages() -> Optional[Path]:
+    """Locate site-packages once per process; the answer doesn't change."""
+    import site
+    
+    # Try user site-packages first
+    user_site = site.getusersitepackages()
+    if user_site and os.path.isdir(user_site):
+        return Path(user_site)
+    
+    # Fall back to system site-packages
+    for site_pkg in site.getsitepackages():
+        if os.path.isdir(site_pkg):
+            return Path(site_pkg)
+    
+    return None
+
+
+def _append_text(path: Path, text: str):
+    """Append text to a file, creating it if needed."""
+    with open(path, "a") as f:
+        f.write(text)
+
+
 class AutoInstrumentor:
     """
     Manages auto-instrumentation for discovered processes.
@@ -44,35 +71,37 @@ class AutoInstrumentor:
         logger.info("Auto-instrumentation started")
         
         # Set up environment for new processes
-        self._setup_environment()
+        await self._setup_environment()
     
     async def stop(self):
         """Stop the auto-instrumentor."""
         self._running = False
         logger.info("Auto-instrumentation stopped")
     
-    def _setup_environment(self):
+    async def _setup_environment(self):
         """Set up environment variables for auto-instrumentation."""
         # Python auto-instrumentation
         if self.config.instrument_python:
-            self._setup_python_instrumentation()
+            await self._setup_python_instrumentation()
         
         # Node.js auto-instrumentation
         if self.config.instrument_nodejs:
-            self._setup_nodejs_instrumentation()
+            await self._setup_nodejs_instrumentation()
         
         # Java auto-instrumentation
         if self.config.instrument_java:
-            self._setup_java_instrumentation()
+            await self._setup_java_instrumentation()
     
-    def _setup_python_instrumentation(self):
+    async def _setup_python_instrumentation(self):
         """
         Set up Python auto-instrumentation.
         
         Uses OpenTelemetry Python auto-instrumentation.
         """
-        # Create sitecustomize.py for automatic instrumentation
-        site_packages = self._get_python_site_packages()
+        # Create sitecustomize.py for automatic instrumentation.
+        # Filesystem calls go through to_thread: site-packages may live on a
+        # slow or network mount and start() shares the exporter's loop.
+        site_packages = await asyncio.to_thread(self._get_python_site_packages)
         if not site_packages:
             return
         
@@ -120,14 +149,15 @@ if os.environ.get("DEVOPSMATE_INSTRUMENT_PYTHON", "true").lower() == "true":
         
         try:
             # Check if file exists and has our marker
-            if sitecustomize_path.exists():
-                content = sitecustomize_path.read_text()
+            if await asyncio.to_thread(sitecustomize_path.exists):
+                content = await asyncio.to_thread(sitecustomize_path.read_text)
                 if "DevopsMate Auto-Instrumentation" in content:
                     return  # Already set up
             
             # Write our instrumentation
-            with open(sitecustomize_path, "a") as f:
-                f.write("\n" + sitecustomize_content)
+            await asyncio.to_thread(
+                _append_text, sitecustomize_path, "\n" + sitecustomize_content
+            )
             
             logger.info(f"Python auto-instrumentation set up at {sitecustomize_path}")
         
@@ -136,7 +166,7 @@ if os.environ.get("DEVOPSMATE_INSTRUMENT_PYTHON", "true").lower() == "true":
         except Exception as e:
             logger.error(f"Failed to set up Python instrumentation: {e}")
     
-    def _setup_nodejs_instrumentation(self):
+    async def _setup_nodejs_instrumentation(self):
         """
         Set up Node.js auto-instrumentation.
         
@@ -176,8 +206,8 @@ console.log('[DevopsMate] Node.js auto-instrumentation active');
         loader_path = self.agent_dir / "nodejs" / "loader.js"
         
         try:
-            loader_path.parent.mkdir(parents=True, exist_ok=True)
-            loader_path.write_text(loader_content)
+            await asyncio.to_thread(loader_path.parent.mkdir, parents=True, exist_ok=True)
+            await asyncio.to_thread(loader_path.write_text, loader_content)
             
             # Set NODE_OPTIONS to preload our instrumentation
             current_options = os.environ.get("NODE_OPTIONS", "")
@@ -189,7 +219,7 @@ console.log('[DevopsMate] Node.js auto-instrumentation active');
         except Exception as e:
             logger.error(f"Failed to set up Node.js instrumentation: {e}")
     
-    def _setup_java_instrumentation(self):
+    async def _setup_java_instrumentation(self):
         """
         Set up Java auto-instrumentation.
         
@@ -200,7 +230,7 @@ console.log('[DevopsMate] Node.js auto-instrumentation active');
         
         if not agent_jar.exists():
             logger.info("Java agent not found, attempting download...")
-            self._download_java_agent(agent_jar)
+            await self._download_java_agent(agent_jar)
         
         if agent_jar.exists():
             # Set JAVA_TOOL_OPTIONS for automatic agent attachment
@@ -214,35 +244,36 @@ console.log('[DevopsMate] Node.js auto-instrumentation active');
             
             logger.info("Java auto-instrumentation configured")
     
-    def _download_java_agent(self, dest_path: Path):
+    async def _download_java_agent(self, dest_path: Path):
         """Download the OpenTelemetry Java agent."""
         url = "https://github.com/open-telemetry/opentelemetry-java-instrumentation/releases/latest/download/opentelemetry-javaagent.jar"
+        # Stream into a side file so an interrupted download never leaves a
+        # truncated JAR where the JVM would pick it up
+        part_path = dest_path.with_suffix(".jar.part")
         
         try:
-            import urllib.request
-            
             dest_path.parent.mkdir(parents=True, exist_ok=True)
-            urllib.request.urlretrieve(url, dest_path)
+            
+            # Streamed through aiohttp so the ~20MB download doesn't block
+            # the event loop the exporter and collectors share
+            timeout = aiohttp.ClientTimeout(total=300)
+            async with aiohttp.ClientSession(timeout=timeout) as session:
+                async with session.get(url) as response:
+                    response.raise_for_status()
+                    with open(part_path, "wb") as f:
+                        async for chunk in response.content.iter_chunked(64 * 1024):
+                            f.write(chunk)
+            
+            part_path.replace(dest_path)
             logger.info(f"Downloaded Java agent to {dest_path}")
         
         except Exception as e:
             logger.error(f"Failed to download Java agent: {e}")
+            part_path.unlink(missing_ok=True)
     
     def _get_python_site_packages(self) -> Optional[Path]:
         """Get the Python site-packages directory."""
-        import site
-        
-        # Try user site-packages first
-        user_site = site.getusersitepackages()
-        if user_site and Path(user_site).exists():
-            return Path(user_site)
-        
-        # Fall back to system site-packages
-        for site_pkg in site.getsitepackages():
-            if Path(site_pkg).exists():
-                return Path(site_pkg)
-        
-        return None
+        return _python_site_packages()
     
     async def instrument_process(self, pid: int, technology: str) -> bool:
         """
@@ -8,6 +8,7 @@ import logging
 from typing import List, Dict, Any
 
 from agent.pkg.config.loader import AgentConfig
+from agent.buffer import DataBuffer
 from agent.internal.core.component import Component, ComponentManager
 from agent.internal.core.collector_manager import CollectorManager
 from agent.internal.core.forwarder import Forwarder
@@ -34,16 +35,23 @@ class Agent:
         # Component manager (like Datadog's component system)
         self.component_manager = ComponentManager()
         
+        # One buffer shared by collectors (producers) and the forwarder
+        # (consumer), so collected data actually reaches the forwarder
+        self.buffer = DataBuffer(
+            max_size=config.buffer_size,
+            flush_interval=config.flush_interval,
+        )
+        
         # Discovery manager
         self.discovery_manager = DiscoveryManager(config)
         self.component_manager.register("discovery", self.discovery_manager)
         
         # Collector manager
-        self.collector_manager = CollectorManager(config)
+        self.collector_manager = CollectorManager(config, self.buffer)
         self.component_manager.register("collectors", self.collector_manager)
         
         # Forwarder (data export)
-        self.forwarder = Forwarder(config)
+        self.forwarder = Forwarder(config, self.buffer)
         self.component_manager.register("forwarder", self.forwarder)
         
         # Stats
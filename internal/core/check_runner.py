@@ -26,9 +26,18 @@ class CheckRunner:
         'network_collector': NetworkCollector,
     }
     
-    def __init__(self, config: Optional[AgentConfig] = None):
+    def __init__(
+        self,
+        config: Optional[AgentConfig] = None,
+        buffer: Optional[DataBuffer] = None,
+    ):
         self.config = config
-        self.buffer = DataBuffer(max_size=1000, flush_interval=10) if config else None
+        # An injected buffer (e.g. the running agent's) is reused as-is;
+        # otherwise one is built on the first run_check, not for --list
+        self.buffer = buffer
+        
+        # One event loop reused by every run_check call, created on first use
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
     
     def list_checks(self) -> List[str]:
         """List all available checks."""
@@ -53,17 +62,18 @@ class CheckRunner:
         if not self.config:
             from agent.config import AgentConfig
             self.config = AgentConfig()
+        if self.buffer is None:
             self.buffer = DataBuffer(max_size=1000, flush_interval=10)
         
         # Create check instance
         check = check_class(self.config, self.buffer)
         
         # Run check
+        if self._loop is None or self._loop.is_closed():
+            self._loop = asyncio.new_event_loop()
+        
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            result = loop.run_until_complete(check.collect())
+            self._loop.run_until_complete(check.collect())
             
             return {
                 'status': 'ok',
@@ -80,5 +90,9 @@ class CheckRunner:
                 'metrics': [],
                 'errors': [str(e)],
             }
-        finally:
-            loop.close()
+    
+    def close(self):
+        """Close the event loop used to run checks."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.close()
+        self._loop = None
@@ -4,8 +4,10 @@ Similar to Datadog's collector/check system.
 """
 
 import asyncio
+import heapq
 import logging
-from typing import List
+import time
+from typing import Dict, List, Optional, Tuple
 from agent.pkg.config.loader import AgentConfig
 from agent.internal.core.component import Component
 from agent.collectors.host_collector import HostMetricsCollector
@@ -16,6 +18,9 @@ from agent.buffer import DataBuffer
 
 logger = logging.getLogger(__name__)
 
+# A collector repeating the same error is logged at most this often
+_ERROR_LOG_INTERVAL = 60.0
+
 
 class CollectorManager(Component):
     """
@@ -27,14 +32,22 @@ class CollectorManager(Component):
     - Handles collector errors
     """
     
-    def __init__(self, config: AgentConfig):
+    # Collectors fill the buffer the forwarder drains: start the forwarder
+    # first and stop it last so nothing collected is stranded
+    depends_on = ("forwarder",)
+    
+    def __init__(self, config: AgentConfig, buffer: Optional[DataBuffer] = None):
         super().__init__("collectors")
         self.config = config
         self.collectors: List = []
-        self.collector_tasks: List[asyncio.Task] = []
+        self._schedule_task: Optional[asyncio.Task] = None
+        # In-flight collect() task per collector index
+        self._collect_tasks: Dict[int, asyncio.Task] = {}
+        # Last logged error per collector: (message, monotonic time)
+        self._last_errors: Dict[str, Tuple[str, float]] = {}
         
-        # Initialize buffer
-        self.buffer = DataBuffer(
+        # Use the agent's shared buffer; standalone use gets its own
+        self.buffer = buffer or DataBuffer(
             max_size=config.buffer_size,
             flush_interval=config.flush_interval,
         )
@@ -64,24 +77,49 @@ class CollectorManager(Component):
                 NetworkCollector(self.config, self.buffer)
             )
         
+        # The collector set is fixed after init, so its status summary is too
+        self._collectors_summary = [
+            {
+                "name": c.__class__.__name__,
+                "interval": getattr(c, 'interval', 0),
+            }
+            for c in self.collectors
+        ]
+        
         logger.info(f"Initialized {len(self.collectors)} collectors")
     
     async def start(self):
         """Start all collectors."""
+        # One scheduler task drives every collector, so the agent wakes once
+        # per due time instead of once per collector
+        self._schedule_task = asyncio.create_task(self._run_schedule())
         for collector in self.collectors:
-            task = asyncio.create_task(self._run_collector(collector))
-            self.collector_tasks.append(task)
-            logger.info(f"Started collector: {collector.__class__.__name__}")
+            logger.info(f"Started collector: {collector.__class__.__name__} (every {collector.interval}s)")
     
     async def stop(self):
         """Stop all collectors."""
-        # Cancel all tasks
-        for task in self.collector_tasks:
+        # Cancel the scheduler and wait for it to unwind
+        task, self._schedule_task = self._schedule_task, None
+        if task is not None:
             task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                # Absorb only the scheduler's own cancellation; one aimed at
+                # the task calling stop() must keep propagating
+                current = asyncio.current_task()
+                if current is not None and current.cancelling():
+                    raise
+            except Exception as e:
+                logger.error(f"Collector scheduler failed: {e}")
         
-        # Wait for tasks to complete
-        if self.collector_tasks:
-            await asyncio.gather(*self.collector_tasks, return_exceptions=True)
+        # Cancel collections still in flight
+        collect_tasks = list(self._collect_tasks.values())
+        self._collect_tasks.clear()
+        for collect_task in collect_tasks:
+            collect_task.cancel()
+        if collect_tasks:
+            await asyncio.gather(*collect_tasks, return_exceptions=True)
         
         # Stop collectors
         for collector in self.collectors:
@@ -90,29 +128,61 @@ class CollectorManager(Component):
             except Exception as e:
                 logger.error(f"Error stopping collector {collector.__class__.__name__}: {e}")
     
-    async def _run_collector(self, collector):
-        """Run a collector continuously."""
-        while self.running:
-            try:
-                await collector.collect()
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error(f"Collector {collector.__class__.__name__} error: {e}")
+    async def _run_schedule(self):
+        """Run collectors from a min-heap of monotonic due times."""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        # (next_due, index) - the index breaks ties without comparing collectors
+        schedule = [(now, index) for index in range(len(self.collectors))]
+        heapq.heapify(schedule)
+        
+        while self.running and schedule:
+            delay = schedule[0][0] - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                # A stop request may have arrived while sleeping
+                if not self.running:
+                    break
             
-            await asyncio.sleep(collector.interval)
+            # Start everything due as its own task, so a slow or hung
+            # collector never holds up the others or the timer
+            now = loop.time()
+            while schedule and schedule[0][0] <= now:
+                next_due, index = heapq.heappop(schedule)
+                collector = self.collectors[index]
+                
+                running = self._collect_tasks.get(index)
+                if running is not None and not running.done():
+                    # Previous run still going; skip this tick, don't pile up
+                    logger.debug(f"Collector {collector.__class__.__name__} still running, skipping tick")
+                else:
+                    self._collect_tasks[index] = asyncio.create_task(self._collect(collector))
+                
+                # Keep each collector on its own cadence; one whose timer fell
+                # behind is rescheduled from now rather than run back to back
+                next_due = max(next_due + collector.interval, now)
+                heapq.heappush(schedule, (next_due, index))
+    
+    async def _collect(self, collector):
+        """Run one collection, logging rather than raising on error."""
+        try:
+            await collector.collect()
+        except Exception as e:
+            self._log_collector_error(collector.__class__.__name__, e)
+    
+    def _log_collector_error(self, name: str, error: Exception):
+        """Log a collector error, suppressing repeats of the same message."""
+        message = str(error)
+        now = time.monotonic()
+        last = self._last_errors.get(name)
+        if last is not None and last[0] == message and now - last[1] < _ERROR_LOG_INTERVAL:
+            return
+        self._last_errors[name] = (message, now)
+        logger.error("Collector %s error: %s", name, message)
     
     def get_status(self) -> dict:
         """Get collector manager status."""
         status = super().get_status()
-        status.update({
-            "collectors_count": len(self.collectors),
-            "collectors": [
-                {
-                    "name": c.__class__.__name__,
-                    "interval": getattr(c, 'interval', 0),
-                }
-                for c in self.collectors
-            ],
-        })
+        status["collectors_count"] = len(self.collectors)
+        status["collectors"] = list(self._collectors_summary)
         return status
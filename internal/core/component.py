@@ -6,7 +6,7 @@ Similar to Datadog's component system.
 import asyncio
 import logging
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +21,10 @@ class Component(ABC):
     - Status: get_status()
     """
     
+    # Names of components this one relies on: they start before it and stop
+    # after it. Components with no ordering between them start/stop together.
+    depends_on: Tuple[str, ...] = ()
+    
     def __init__(self, name: str):
         self.name = name
         self.running = False
@@ -68,26 +72,61 @@ class ComponentManager:
         logger.debug(f"Registered component: {name}")
     
     async def start_all(self):
-        """Start all registered components."""
-        for name, component in self.components.items():
-            try:
-                logger.info(f"Starting component: {name}")
-                await component.start()
-                component.running = True
-            except Exception as e:
-                logger.error(f"Failed to start component {name}: {e}")
-                raise
+        """Start all registered components, dependencies first."""
+        blockers = {
+            name: set(component.depends_on) & self.components.keys()
+            for name, component in self.components.items()
+        }
+        for wave in self._waves(list(self.components), blockers.__getitem__):
+            await asyncio.gather(*(self._start_component(name) for name in wave))
     
     async def stop_all(self):
-        """Stop all registered components."""
+        """Stop all registered components, dependents first."""
+        blockers: Dict[str, Set[str]] = {name: set() for name in self.components}
+        for name, component in self.components.items():
+            for dependency in component.depends_on:
+                if dependency in blockers:
+                    blockers[dependency].add(name)
         # Stop in reverse order
-        for name, component in reversed(list(self.components.items())):
-            try:
-                logger.info(f"Stopping component: {name}")
-                await component.stop()
-                component.running = False
-            except Exception as e:
-                logger.error(f"Error stopping component {name}: {e}")
+        for wave in self._waves(list(reversed(self.components)), blockers.__getitem__):
+            await asyncio.gather(*(self._stop_component(name) for name in wave))
+    
+    @staticmethod
+    def _waves(order: List[str], blockers: Callable[[str], Set[str]]) -> List[List[str]]:
+        """Group names into waves; each wave only waits on earlier waves."""
+        waves = []
+        done: Set[str] = set()
+        pending = order
+        while pending:
+            wave = [name for name in pending if blockers(name) <= done]
+            if not wave:
+                # Dependency cycle: fall back to plain registration order
+                wave = pending[:1]
+            waves.append(wave)
+            done.update(wave)
+            pending = [name for name in pending if name not in done]
+        return waves
+    
+    async def _start_component(self, name: str):
+        """Start a single component."""
+        component = self.components[name]
+        try:
+            logger.info(f"Starting component: {name}")
+            await component.start()
+            component.running = True
+        except Exception as e:
+            logger.error(f"Failed to start component {name}: {e}")
+            raise
+    
+    async def _stop_component(self, name: str):
+        """Stop a single component, logging rather than raising on error."""
+        component = self.components[name]
+        try:
+            logger.info(f"Stopping component: {name}")
+            await component.stop()
+            component.running = False
+        except Exception as e:
+            logger.error(f"Error stopping component {name}: {e}")
     
     def get_status(self) -> Dict[str, Dict[str, Any]]:
         """Get status of all components."""
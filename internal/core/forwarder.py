@@ -5,6 +5,7 @@ Similar to Datadog's forwarder component.
 
 import asyncio
 import logging
+from typing import Optional
 from agent.pkg.config.loader import AgentConfig
 from agent.internal.core.component import Component
 from agent.pkg.forwarder.forwarder import Forwarder as EnhancedForwarder, ForwarderConfig, EndpointConfig
@@ -27,21 +28,18 @@ class Forwarder(Component):
     - Event platform support
     """
     
-    def __init__(self, config: AgentConfig):
+    def __init__(self, config: AgentConfig, buffer: Optional[DataBuffer] = None):
         super().__init__("forwarder")
         self.config = config
         self.forwarder: EnhancedForwarder = None
-        self.buffer: DataBuffer = None
+        # Drains the same buffer the collectors fill; standalone use gets its own
+        self.buffer: DataBuffer = buffer or DataBuffer(
+            max_size=config.buffer_size,
+            flush_interval=config.flush_interval,
+        )
     
     async def start(self):
         """Start the forwarder."""
-        # Get buffer from collector manager (shared)
-        # For now, create our own
-        self.buffer = DataBuffer(
-            max_size=self.config.buffer_size,
-            flush_interval=self.config.flush_interval,
-        )
-        
         # Build endpoint configs
         endpoints = [
             EndpointConfig(
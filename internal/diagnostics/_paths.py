@@ -0,0 +1,23 @@
+"""
+Shared file locations for diagnostics and flare collection.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+# Standard config file locations, in lookup order
+CONFIG_PATHS = (
+    Path("agent.yaml"),
+    Path("/etc/devopsmate/agent.yaml"),
+    Path.home() / ".devopsmate" / "agent.yaml",
+)
+
+
+@lru_cache(maxsize=1)
+def find_config_path() -> Optional[Path]:
+    """Find the first existing config file (probed once per process)."""
+    for path in CONFIG_PATHS:
+        if path.exists():
+            return path
+    return None
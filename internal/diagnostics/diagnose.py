@@ -3,44 +3,114 @@ Comprehensive diagnostics system.
 Similar to Datadog's diagnose command.
 """
 
+import importlib.util
+import os
 import sys
 import platform
 import socket
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, List, Optional, Tuple
 import logging
 
+from agent.internal.diagnostics._paths import find_config_path
+
 logger = logging.getLogger(__name__)
 
+# Upper bound on waiting for any single DNS/TCP probe
+_PROBE_TIMEOUT = 5.0
+
+
+def _resolve_own_hostname() -> str:
+    """Resolve this machine's hostname, returning the hostname."""
+    hostname = socket.gethostname()
+    socket.gethostbyname(hostname)
+    return hostname
+
+
+def _tcp_connect(host: str, port: int, timeout: float = 2.0):
+    """Open and close a TCP connection, raising if it can't be made."""
+    with socket.create_connection((host, port), timeout=timeout):
+        pass
+
+
+# Blocking network probes, run concurrently so diagnostics take as long as
+# the slowest probe rather than the sum of all of them
+_PROBES: Dict[str, Callable[[], Any]] = {
+    'hostname': _resolve_own_hostname,
+    'dns': lambda: socket.gethostbyname('google.com'),
+    'google_dns_tcp': lambda: _tcp_connect('8.8.8.8', 53),  # Google DNS
+}
+
 
-def run_diagnostics() -> Dict[str, Dict[str, Dict[str, Any]]]:
+# Network checks are reused for this long by later runs in the same process
+_NETWORK_CACHE_TTL = 60.0
+_network_cache: Tuple[float, Optional[Dict[str, Dict[str, Any]]]] = (0.0, None)
+
+
+def _probe_result(future: Future) -> Any:
+    """Wait for a probe, turning a timeout into a readable error."""
+    try:
+        return future.result(timeout=_PROBE_TIMEOUT)
+    except FutureTimeoutError:
+        raise TimeoutError(f"timed out after {_PROBE_TIMEOUT:.0f}s") from None
+
+
+def run_diagnostics(deep: bool = False, fast: bool = False) -> Dict[str, Dict[str, Dict[str, Any]]]:
     """
     Run comprehensive diagnostics.
     
+    Args:
+        deep: Fully import components instead of only locating them
+        fast: Skip the network checks (DNS lookup, outbound connect)
+        
     Returns:
         Dict with category -> check_name -> result
     """
+    global _network_cache
     results = {}
     
-    # System checks
-    results['System'] = _check_system()
-    
-    # Configuration checks
-    results['Configuration'] = _check_configuration()
-    
-    # Network checks
-    results['Network'] = _check_network()
+    network = None
+    if not fast:
+        cached_at, cached = _network_cache
+        if cached is not None and time.monotonic() - cached_at < _NETWORK_CACHE_TTL:
+            network = cached
     
-    # File system checks
-    results['File System'] = _check_filesystem()
+    # Only probe the network when its result is actually needed
+    probe_names = ['hostname'] if fast or network is not None else list(_PROBES)
     
-    # Component checks
-    results['Components'] = _check_components()
+    # Kick off network probes first so they overlap with the local checks
+    executor = ThreadPoolExecutor(max_workers=len(probe_names), thread_name_prefix="diagnose")
+    try:
+        probes = {name: executor.submit(_PROBES[name]) for name in probe_names}
+        
+        # System checks
+        results['System'] = _check_system(probes)
+        
+        # Configuration checks
+        results['Configuration'] = _check_configuration()
+        
+        # Network checks
+        if not fast:
+            if network is None:
+                network = _check_network(probes)
+                _network_cache = (time.monotonic(), network)
+            results['Network'] = network
+        
+        # File system checks
+        results['File System'] = _check_filesystem()
+        
+        # Component checks
+        results['Components'] = _check_components(deep)
+    finally:
+        # Don't wait on a probe that is still stuck in the resolver
+        executor.shutdown(wait=False, cancel_futures=True)
     
     return results
 
 
-def _check_system() -> Dict[str, Dict[str, Any]]:
+def _check_system(probes: Dict[str, Future]) -> Dict[str, Dict[str, Any]]:
     """Check system-level diagnostics."""
     checks = {}
     
@@ -58,8 +128,7 @@ def _check_system() -> Dict[str, Dict[str, Any]]:
     
     # Hostname resolution
     try:
-        hostname = socket.gethostname()
-        socket.gethostbyname(hostname)
+        hostname = _probe_result(probes['hostname'])
         checks['Hostname Resolution'] = {
             'status': 'ok',
             'message': f"Hostname '{hostname}' resolves correctly",
@@ -79,17 +148,7 @@ def _check_configuration() -> Dict[str, Dict[str, Any]]:
     checks = {}
     
     # Config file locations
-    config_paths = [
-        Path("agent.yaml"),
-        Path("/etc/devopsmate/agent.yaml"),
-        Path.home() / ".devopsmate" / "agent.yaml",
-    ]
-    
-    found_config = None
-    for path in config_paths:
-        if path.exists():
-            found_config = path
-            break
+    found_config = find_config_path()
     
     if found_config:
         checks['Config File'] = {
@@ -131,13 +190,13 @@ def _check_configuration() -> Dict[str, Dict[str, Any]]:
     return checks
 
 
-def _check_network() -> Dict[str, Dict[str, Any]]:
+def _check_network(probes: Dict[str, Future]) -> Dict[str, Dict[str, Any]]:
     """Check network diagnostics."""
     checks = {}
     
     # DNS resolution
     try:
-        socket.gethostbyname('google.com')
+        _probe_result(probes['dns'])
         checks['DNS Resolution'] = {
             'status': 'ok',
             'message': "DNS resolution working",
@@ -150,21 +209,11 @@ def _check_network() -> Dict[str, Dict[str, Any]]:
         }
     
     # Connectivity to common endpoints
-    endpoints = [
-        ('8.8.8.8', 53),  # Google DNS
-    ]
-    
     connectivity_ok = True
-    for host, port in endpoints:
-        try:
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(2)
-            result = sock.connect_ex((host, port))
-            sock.close()
-            if result != 0:
-                connectivity_ok = False
-        except Exception:
-            connectivity_ok = False
+    try:
+        _probe_result(probes['google_dns_tcp'])
+    except Exception:
+        connectivity_ok = False
     
     checks['Network Connectivity'] = {
         'status': 'ok' if connectivity_ok else 'warning',
@@ -202,9 +251,13 @@ def _check_filesystem() -> Dict[str, Dict[str, Any]]:
     
     # Check write permissions
     try:
-        test_file = Path("/tmp") / "devopsmate_test_write"
-        test_file.write_text("test")
-        test_file.unlink()
+        # access(2) settles the common case without creating a file; only
+        # when it says no (it can be wrong on uid-mapped FUSE/overlay mounts)
+        # is a real write attempted, which also yields the actual error
+        if not os.access("/tmp", os.W_OK):
+            test_file = Path("/tmp") / "devopsmate_test_write"
+            test_file.write_text("test")
+            test_file.unlink()
         checks['Write Permissions'] = {
             'status': 'ok',
             'message': "Write permissions OK",
@@ -219,8 +272,13 @@ def _check_filesystem() -> Dict[str, Dict[str, Any]]:
     return checks
 
 
-def _check_components() -> Dict[str, Dict[str, Any]]:
-    """Check component diagnostics."""
+def _check_components(deep: bool = False) -> Dict[str, Dict[str, Any]]:
+    """
+    Check component diagnostics.
+    
+    By default only locates each module (find_spec), which avoids running
+    the aiohttp/docker/psutil import chain; deep mode imports them fully.
+    """
     checks = {}
     
     # Check if components can be imported
@@ -232,10 +290,16 @@ def _check_components() -> Dict[str, Dict[str, Any]]:
     
     for comp_name, module_path in components:
         try:
-            __import__(module_path)
+            if deep:
+                __import__(module_path)
+                message = "Component can be imported"
+            elif importlib.util.find_spec(module_path) is not None:
+                message = "Component module found"
+            else:
+                raise ImportError(f"No module named '{module_path}'")
             checks[comp_name] = {
                 'status': 'ok',
-                'message': "Component can be imported",
+                'message': message,
             }
         except Exception as e:
             checks[comp_name] = {
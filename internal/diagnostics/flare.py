@@ -3,16 +3,41 @@ Flare collection - collect diagnostic information.
 Similar to Datadog's agent flare command.
 """
 
+import io
+import json
+import platform
+import re
+import socket
+import sys
 import tarfile
 import tempfile
-import shutil
-import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Iterator, Optional
 import logging
 
+from agent.internal.diagnostics._paths import find_config_path
+
+try:
+    import orjson
+except ImportError:  # Optional dependency, fall back to stdlib json
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency, fall back to gzip
+    zstandard = None
+
 logger = logging.getLogger(__name__)
 
+# Secrets in config files (api_key, api-key, token, ...), redacted in one pass
+_REDACT_RE = re.compile(r'(api[_-]?key|token):\s*["\']?[^"\'\n]+["\']?', re.IGNORECASE)
+
+# Read size when copying files into the archive (tarfile defaults to 16KB)
+_COPY_BUFSIZE = 1024 * 1024
+
 
 def collect_flare(output_path: Optional[str] = None, include_sensitive: bool = False) -> str:
     """
@@ -33,49 +58,102 @@ def collect_flare(output_path: Optional[str] = None, include_sensitive: bool = F
         Path to created flare file
     """
     if not output_path:
-        import time
-        output_path = f"devopsmate-agent-flare-{int(time.time())}.tar.gz"
+        extension = "tar.zst" if zstandard is not None else "tar.gz"
+        output_path = f"devopsmate-agent-flare-{int(time.time())}.{extension}"
+    elif output_path.endswith(".zst") and zstandard is None:
+        logger.warning("zstandard not installed, writing a gzip flare instead")
+        output_path = output_path[:-len(".zst")] + ".gz"
     
-    with tempfile.TemporaryDirectory() as tmpdir:
-        flare_dir = Path(tmpdir) / "flare"
-        flare_dir.mkdir()
-        
+    # Entries are written straight into the archive: source files are read
+    # once and generated reports never touch disk before being archived
+    with _open_flare_archive(output_path) as tar:
         # Collect logs
-        log_dir = flare_dir / "logs"
-        log_dir.mkdir()
-        _collect_logs(log_dir)
+        _collect_logs(tar)
         
         # Collect config (with sensitive data handling)
-        config_dir = flare_dir / "config"
-        config_dir.mkdir()
-        _collect_config(config_dir, include_sensitive)
+        _collect_config(tar, include_sensitive)
         
         # Collect system info
-        system_file = flare_dir / "system_info.txt"
-        _collect_system_info(system_file)
+        _collect_system_info(tar)
         
         # Collect agent status
-        status_file = flare_dir / "agent_status.json"
-        _collect_agent_status(status_file)
+        _collect_agent_status(tar)
         
         # Collect component-specific flare data
-        components_dir = flare_dir / "components"
-        components_dir.mkdir()
-        _collect_component_flare(components_dir)
+        _collect_component_flare(tar)
         
         # Collect network info
-        network_file = flare_dir / "network_info.txt"
-        _collect_network_info(network_file)
-        
-        # Create tarball
-        with tarfile.open(output_path, "w:gz") as tar:
-            tar.add(flare_dir, arcname="flare")
-        
-        logger.info(f"Flare collected: {output_path}")
-        return output_path
+        _collect_network_info(tar)
+    
+    logger.info(f"Flare collected: {output_path}")
+    return output_path
+
+
+@contextmanager
+def _open_flare_archive(output_path: str) -> Iterator[tarfile.TarFile]:
+    """Open the flare archive: zstd for .zst paths, fast gzip otherwise."""
+    if output_path.endswith(".zst"):
+        with open(output_path, "wb") as f:
+            compressor = zstandard.ZstdCompressor(level=3, threads=-1)
+            with compressor.stream_writer(f) as stream:
+                with tarfile.open(mode="w|", fileobj=stream, copybufsize=_COPY_BUFSIZE) as tar:
+                    yield tar
+    else:
+        # gzip's default level 9 costs several times the CPU of level 1
+        # for a few percent on log text
+        with tarfile.open(output_path, "w:gz", compresslevel=1, copybufsize=_COPY_BUFSIZE) as tar:
+            yield tar
+
+
+def _to_json(obj) -> bytes:
+    """Serialize a flare report as indented JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(
+            obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str
+        )
+    return json.dumps(obj, indent=2, default=str).encode()
+
+
+def _add_bytes(tar: tarfile.TarFile, name: str, data: bytes):
+    """Add an in-memory file to the flare archive."""
+    _add_fileobj(tar, name, io.BytesIO(data), len(data))
+
 
+def _add_fileobj(tar: tarfile.TarFile, name: str, fileobj: BinaryIO, size: int):
+    """Add size bytes read from fileobj to the flare archive."""
+    info = tarfile.TarInfo(name=f"flare/{name}")
+    info.size = size
+    info.mtime = int(time.time())
+    info.mode = 0o644
+    tar.addfile(info, fileobj)
 
-def _collect_logs(log_dir: Path):
+
+class _FixedSizeReader:
+    """
+    Read exactly size bytes from a file that may shrink while being read.
+    
+    A tar header is written before the contents, so the entry size is fixed
+    up front. Bytes the file no longer has are returned as NULs, keeping the
+    archive well-formed, and counted in padded. Growth past size is ignored.
+    """
+    
+    def __init__(self, fileobj: BinaryIO, size: int):
+        self._fileobj = fileobj
+        self._remaining = size
+        self.padded = 0
+    
+    def read(self, n: int = -1) -> bytes:
+        if n < 0 or n > self._remaining:
+            n = self._remaining
+        data = self._fileobj.read(n)
+        if len(data) < n:
+            self.padded += n - len(data)
+            data += bytes(n - len(data))
+        self._remaining -= n
+        return data
+
+
+def _collect_logs(tar: tarfile.TarFile):
     """Collect agent logs."""
     log_paths = [
         Path("/var/log/devopsmate-agent.log"),
@@ -84,40 +162,50 @@ def _collect_logs(log_dir: Path):
     ]
     
     for log_path in log_paths:
-        if log_path.exists():
-            shutil.copy2(log_path, log_dir / log_path.name)
-            break
+        try:
+            log_file = open(log_path, "rb")
+        except FileNotFoundError:
+            continue
+        
+        with log_file:
+            # Header from fstat of the open file, so size and mtime describe
+            # exactly what is about to be read
+            info = tar.gettarinfo(arcname=f"flare/logs/{log_path.name}", fileobj=log_file)
+            reader = _FixedSizeReader(log_file, info.size)
+            tar.addfile(info, reader)
+        
+        if reader.padded:
+            # Truncated in place (e.g. logrotate copytruncate) while copying
+            logger.warning(f"{log_path} shrank while being copied; padded {reader.padded} bytes")
+            _add_bytes(tar, f"logs/{log_path.name}.truncated", (
+                f"{log_path} was truncated while the flare was being collected. "
+                f"{reader.padded} of the {info.size} bytes in logs/{log_path.name} "
+                f"are NUL padding where the file had shrunk, not log data.\n"
+            ).encode())
+        break
 
 
-def _collect_config(config_dir: Path, include_sensitive: bool = False):
+def _collect_config(tar: tarfile.TarFile, include_sensitive: bool = False):
     """Collect configuration files."""
-    config_paths = [
-        Path("agent.yaml"),
-        Path("/etc/devopsmate/agent.yaml"),
-        Path.home() / ".devopsmate" / "agent.yaml",
-    ]
+    config_path = find_config_path()
+    if config_path is None:
+        return
     
-    for config_path in config_paths:
-        if config_path.exists():
-            if include_sensitive:
-                shutil.copy2(config_path, config_dir / config_path.name)
-            else:
-                # Remove sensitive data
-                content = config_path.read_text()
-                # Remove API keys, tokens, etc.
-                import re
-                content = re.sub(r'api_key:\s*["\']?[^"\'\n]+["\']?', 'api_key: "***REDACTED***"', content)
-                content = re.sub(r'api-key:\s*["\']?[^"\'\n]+["\']?', 'api-key: "***REDACTED***"', content)
-                content = re.sub(r'token:\s*["\']?[^"\'\n]+["\']?', 'token: "***REDACTED***"', content)
-                (config_dir / config_path.name).write_text(content)
-            break
-
-
-def _collect_system_info(output_file: Path):
+    if include_sensitive:
+        tar.add(config_path, arcname=f"flare/config/{config_path.name}")
+    else:
+        # Remove API keys, tokens, etc. line by line; the redacted copy stays
+        # in memory when small and spills to a temp file when it isn't
+        with open(config_path) as src, tempfile.SpooledTemporaryFile(max_size=_COPY_BUFSIZE) as redacted:
+            for line in src:
+                redacted.write(_REDACT_RE.sub(r'\1: "***REDACTED***"', line).encode())
+            size = redacted.tell()
+            redacted.seek(0)
+            _add_fileobj(tar, f"config/{config_path.name}", redacted, size)
+
+
+def _collect_system_info(tar: tarfile.TarFile):
     """Collect system information."""
-    import platform
-    import sys
-    
     info = f"""System Information
 ==================
 Platform: {platform.platform()}
@@ -129,19 +217,18 @@ Processor: {platform.processor()}
 Python: {sys.version}
 """
     
-    output_file.write_text(info)
+    _add_bytes(tar, "system_info.txt", info.encode())
 
 
-def _collect_agent_status(output_file: Path):
+def _collect_agent_status(tar: tarfile.TarFile):
     """Collect agent status."""
     from agent.internal.status.status import get_agent_status
-    import json
     
     status = get_agent_status(detailed=True)
-    output_file.write_text(json.dumps(status, indent=2, default=str))
+    _add_bytes(tar, "agent_status.json", _to_json(status))
 
 
-def _collect_component_flare(components_dir: Path):
+def _collect_component_flare(tar: tarfile.TarFile):
     """Collect component-specific flare data."""
     # This would collect data from each component
     # For now, create placeholder files
@@ -149,33 +236,36 @@ def _collect_component_flare(components_dir: Path):
     components = ["discovery", "collectors", "forwarder"]
     
     for comp_name in components:
-        comp_file = components_dir / f"{comp_name}.json"
-        comp_file.write_text(json.dumps({
+        _add_bytes(tar, f"components/{comp_name}.json", _to_json({
             "component": comp_name,
             "status": "unknown",
             "note": "Component flare data collection not yet implemented"
-        }, indent=2))
+        }))
 
 
-def _collect_network_info(output_file: Path):
+def _collect_network_info(tar: tarfile.TarFile):
     """Collect network information."""
-    import socket
-    import platform
-    
     info = []
     info.append("Network Information")
     info.append("=" * 50)
-    info.append(f"Hostname: {socket.gethostname()}")
-    info.append(f"FQDN: {socket.getfqdn()}")
+    hostname = socket.gethostname()
+    
+    # Both lookups may hit DNS; run them side by side
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="flare")
+    fqdn_future = executor.submit(socket.getfqdn, hostname)
+    addrs_future = executor.submit(socket.gethostbyname_ex, hostname)
+    executor.shutdown(wait=False)
+    
+    info.append(f"Hostname: {hostname}")
+    info.append(f"FQDN: {fqdn_future.result()}")
     
     try:
         # Get IP addresses
-        hostname = socket.gethostname()
-        ip_addrs = socket.gethostbyname_ex(hostname)[2]
+        ip_addrs = addrs_future.result()[2]
         info.append(f"\nIP Addresses:")
         for ip in ip_addrs:
             info.append(f"  - {ip}")
     except Exception as e:
         info.append(f"\nError getting IP addresses: {e}")
     
-    output_file.write_text("\n".join(info))
+    _add_bytes(tar, "network_info.txt", "\n".join(info).encode())
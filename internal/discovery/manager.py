@@ -57,21 +57,21 @@ class DiscoveryManager(Component):
     
     async def _run_discovery(self):
         """Run discovery for all modules."""
-        try:
-            # Discover processes
-            processes = await self.process_discovery.discover()
-            logger.debug(f"Discovered {len(processes)} processes")
-            
-            # Discover containers
-            containers = await self.container_discovery.discover()
-            logger.debug(f"Discovered {len(containers)} containers")
-            
-            # Discover network
-            connections = await self.network_discovery.discover()
-            logger.debug(f"Discovered {len(connections)} network connections")
-            
-        except Exception as e:
-            logger.error(f"Discovery error: {e}")
+        # The three scans are independent; run them side by side so a cycle
+        # takes as long as the slowest one rather than their sum
+        kinds = ("processes", "containers", "network connections")
+        results = await asyncio.gather(
+            self.process_discovery.discover(),
+            self.container_discovery.discover(),
+            self.network_discovery.discover(),
+            return_exceptions=True,
+        )
+        for kind, result in zip(kinds, results):
+            if isinstance(result, Exception):
+                logger.error("Discovery error (%s): %s", kind, result)
+            else:
+                # Lazy formatting: this runs every cycle and debug is usually off
+                logger.debug("Discovered %d %s", len(result), kind)
     
     async def _periodic_discovery(self):
         """Run discovery periodically."""
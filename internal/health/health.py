@@ -7,10 +7,14 @@ from typing import Dict, Any, List
 from agent.internal.status.status import get_agent_status
 
 
-def check_health() -> Dict[str, Any]:
+def check_health(fast: bool = False) -> Dict[str, Any]:
     """
     Check agent health.
     
+    Args:
+        fast: Return at the first failure instead of collecting every
+            error; enough for liveness probes that only need the verdict
+    
     Returns:
         Dict with 'healthy' bool and 'errors' list
     """
@@ -25,11 +29,14 @@ def check_health() -> Dict[str, Any]:
         errors.append("Agent is not running")
     
     # Check components
-    components = status.get("components", {})
-    for comp_name, comp_status in components.items():
-        if not comp_status.get("healthy", False):
-            healthy = False
-            errors.append(f"Component {comp_name} is unhealthy")
+    if healthy or not fast:
+        components = status.get("components", {})
+        for comp_name, comp_status in components.items():
+            if not comp_status.get("healthy", False):
+                healthy = False
+                errors.append(f"Component {comp_name} is unhealthy")
+                if fast:
+                    break
     
     return {
         "healthy": healthy,
@@ -3,19 +3,59 @@ Agent status reporting.
 Similar to Datadog's status command.
 """
 
+import copy
+import errno
 import os
 import json
+import select
+import threading
 import time
 import platform
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # Optional dependency, fall back to stdlib json
+    orjson = None
+
+# Seconds a computed status is reused; health probes may poll many times a second
+_STATUS_TTL = float(os.getenv("DEVOPSMATE_STATUS_TTL", "2"))
+
+# detailed flag -> (monotonic time computed, status); the detailed status is
+# much more expensive so it is cached separately
+_status_cache: Dict[bool, Tuple[float, Dict[str, Any]]] = {}
+_status_lock = threading.Lock()
+
+# PID file locations, in lookup order
+_PID_FILES = (
+    "/var/run/devopsmate-agent.pid",
+    str(Path.home() / ".devopsmate" / "agent.pid"),
+)
+
+# Constant for the life of the process; platform lookups parse files or
+# spawn subprocesses on some systems, so do them once at import
+_PLATFORM = f"{platform.system()} {platform.release()}"
+_PYTHON_VERSION = platform.python_version()
+
+# psutil, imported on the first detailed status and reused after that
+_psutil = None
+
+# Agent start time (epoch seconds) by PID; fixed for a process's lifetime,
+# dropped as soon as that PID is seen to have exited
+_create_times: Dict[int, float] = {}
+
+# Whether pidfd_open (Linux 5.3+) can be used; cleared if the kernel lacks it
+_pidfd_supported = hasattr(os, "pidfd_open")
 
 
 def get_agent_status(detailed: bool = False) -> Dict[str, Any]:
     """
     Get current agent status.
     
-    Similar to Datadog's agent status command.
+    Similar to Datadog's agent status command. Results are reused for
+    DEVOPSMATE_STATUS_TTL seconds (default 2), except a stopped agent,
+    which is re-checked on every call so a restart shows up promptly.
     
     Args:
         detailed: If True, include detailed component status
@@ -23,47 +63,55 @@ def get_agent_status(detailed: bool = False) -> Dict[str, Any]:
     Returns:
         Dict with agent status information
     """
-    # Check if agent is running (check PID file or process)
-    pid_file = Path("/var/run/devopsmate-agent.pid")
-    pid_file_alt = Path.home() / ".devopsmate" / "agent.pid"
-    
+    with _status_lock:
+        cached = _status_cache.get(detailed)
+        if cached is not None and time.monotonic() - cached[0] < _STATUS_TTL:
+            # Deep copy: callers may modify the nested components dicts too
+            return copy.deepcopy(cached[1])
+        
+        status = _read_agent_status(detailed)
+        if status["status"] == "stopped":
+            _status_cache.pop(detailed, None)
+        else:
+            _status_cache[detailed] = (time.monotonic(), status)
+        return copy.deepcopy(status)
+
+
+def _read_agent_status(detailed: bool) -> Dict[str, Any]:
+    """Build the agent status from the PID file and process table."""
     status = {
         "version": "1.0.0",
         "status": "unknown",
         "pid": None,
         "uptime": "unknown",
-        "platform": f"{platform.system()} {platform.release()}",
-        "python_version": platform.python_version(),
+        "platform": _PLATFORM,
+        "python_version": _PYTHON_VERSION,
         "components": {},
     }
     
-    # Try to read PID file
-    pid = None
-    for pid_path in [pid_file, pid_file_alt]:
-        if pid_path.exists():
-            try:
-                pid = int(pid_path.read_text().strip())
-                status["pid"] = pid
-                status["status"] = "running"
-                
-                # Check if process is actually running
-                try:
-                    os.kill(pid, 0)  # Signal 0 just checks if process exists
-                    
-                    # Try to get uptime from process start time
-                    if detailed:
-                        try:
-                            import psutil
-                            proc = psutil.Process(pid)
-                            uptime_seconds = time.time() - proc.create_time()
-                            status["uptime"] = _format_uptime(uptime_seconds)
-                        except:
-                            pass
-                except OSError:
-                    status["status"] = "stopped"
-                break
-            except Exception:
-                pass
+    # Check if agent is running (check PID file or process)
+    for pid_path in _PID_FILES:
+        try:
+            pid = _read_pid(pid_path)
+        except (OSError, ValueError):
+            # Missing, unreadable or garbled; try the next location
+            continue
+        
+        status["pid"] = pid
+        status["status"] = "running"
+        
+        # Check if process is actually running
+        if _is_running(pid):
+            # Try to get uptime from process start time
+            if detailed:
+                started = _process_start_time(pid)
+                if started is not None:
+                    uptime_seconds = time.time() - started
+                    status["uptime"] = _format_uptime(uptime_seconds)
+        else:
+            _create_times.pop(pid, None)
+            status["status"] = "stopped"
+        break
     
     # Get component status if detailed
     if detailed:
@@ -72,6 +120,72 @@ def get_agent_status(detailed: bool = False) -> Dict[str, Any]:
     return status
 
 
+def _read_pid(path: str) -> int:
+    """Read a PID file with a single open/read/close, no existence check."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        # int() parses ASCII bytes directly and ignores surrounding whitespace
+        return int(os.read(fd, 32))
+    finally:
+        os.close(fd)
+
+
+def _is_running(pid: int) -> bool:
+    """Check whether a process exists and has not exited."""
+    global _pidfd_supported
+    if _pidfd_supported:
+        try:
+            fd = os.pidfd_open(pid)
+        except ProcessLookupError:
+            return False
+        except OSError as e:
+            if e.errno == errno.ENOSYS:
+                _pidfd_supported = False
+        else:
+            try:
+                # A pidfd turns readable once the process exits, so zombies
+                # awaiting reaping count as stopped
+                poller = select.poll()
+                poller.register(fd, select.POLLIN)
+                return not poller.poll(0)
+            finally:
+                os.close(fd)
+    
+    try:
+        os.kill(pid, 0)  # Signal 0 just checks if process exists
+    except PermissionError:
+        return True  # Exists, but owned by another user
+    except OSError:
+        return False
+    return True
+
+
+def _process_start_time(pid: int) -> Optional[float]:
+    """Get a process's start time (remembered per PID), None if unavailable."""
+    global _psutil
+    
+    started = _create_times.get(pid)
+    if started is not None:
+        return started
+    
+    if _psutil is None:
+        try:
+            import psutil as _psutil
+        except ImportError:
+            return None
+    
+    try:
+        started = _psutil.Process(pid).create_time()
+    except _psutil.Error:
+        # Gone, access denied or a zombie since the liveness check
+        return None
+    
+    # Only the current agent process is worth remembering
+    _create_times.clear()
+    _create_times[pid] = started
+    return started
+
+
 def _format_uptime(seconds: float) -> str:
     """Format uptime in human-readable format."""
     days = int(seconds // 86400)
@@ -112,6 +226,25 @@ def _get_component_status() -> Dict[str, Any]:
     return components
 
 
+# Text status header, filled in with one format_map call
+_STATUS_TEXT = (
+    "=== DevopsMate Agent Status ===\n"
+    "Version: {version}\n"
+    "Status: {status}\n"
+    "PID: {pid}\n"
+    "Uptime: {uptime}\n"
+    "Platform: {platform}\n"
+    "Python: {python_version}"
+)
+
+
+class _StatusFields(dict):
+    """Status values for _STATUS_TEXT; missing fields read as unknown."""
+    
+    def __missing__(self, key: str) -> str:
+        return "N/A" if key == "pid" else "unknown"
+
+
 def format_status(status: Dict[str, Any], format: str = "text") -> str:
     """
     Format status output.
@@ -124,17 +257,12 @@ def format_status(status: Dict[str, Any], format: str = "text") -> str:
         Formatted status string
     """
     if format == "json":
+        if orjson is not None:
+            return orjson.dumps(status, option=orjson.OPT_INDENT_2).decode()
         return json.dumps(status, indent=2)
     
     # Text format
-    lines = []
-    lines.append("=== DevopsMate Agent Status ===")
-    lines.append(f"Version: {status.get('version', 'unknown')}")
-    lines.append(f"Status: {status.get('status', 'unknown')}")
-    lines.append(f"PID: {status.get('pid', 'N/A')}")
-    lines.append(f"Uptime: {status.get('uptime', 'unknown')}")
-    lines.append(f"Platform: {status.get('platform', 'unknown')}")
-    lines.append(f"Python: {status.get('python_version', 'unknown')}")
+    lines = [_STATUS_TEXT.format_map(_StatusFields(status))]
     
     if status.get('components'):
         lines.append("\nComponents:")
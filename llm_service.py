@@ -9,12 +9,32 @@ Provides LLM capabilities for:
 - Code/issue analysis
 """
 
+import asyncio
+import itertools
+import json
 import logging
-from typing import Any, Dict, List, Optional
+import os
+import re
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # Optional dependency, fall back to stdlib json
+    orjson = None
+
+try:
+    from openai import AsyncOpenAI
+except ImportError:  # Optional dependency, chat falls back to canned responses
+    AsyncOpenAI = None
+
 logger = logging.getLogger(__name__)
 
+# Ollama clients by base URL, shared by every LLMService so requests to the
+# same server reuse one HTTP connection pool instead of opening new ones
+_clients: Dict[str, Any] = {}
+
 
 class LLMProvider(str, Enum):
     """Supported LLM providers - Ollama only (local, free)"""
@@ -40,6 +60,79 @@ class TaskType(str, Enum):
     GENERAL = "general"
 
 
+# Env var naming the model for each routed task type, and its fallback
+_CODE_MODEL_ENV = "OLLAMA_CODE_MODEL"
+_ANALYTICS_MODEL_ENV = "OLLAMA_ANALYTICS_MODEL"
+_MODEL_ENV_DEFAULTS = {
+    _CODE_MODEL_ENV: "qwen2.5-coder:32b",
+    _ANALYTICS_MODEL_ENV: "mixtral:8x7b",
+}
+
+# Task type -> model env var; types not listed use the default model
+_TASK_MODEL_ENV = {
+    # Code-focused tasks -> qwen2.5-coder:32b
+    TaskType.CODE: _CODE_MODEL_ENV,
+    TaskType.INFRASTRUCTURE: _CODE_MODEL_ENV,
+    TaskType.PLAN: _CODE_MODEL_ENV,
+    TaskType.EXECUTE: _CODE_MODEL_ENV,
+    
+    # Analytics-focused tasks -> mixtral:8x7b
+    TaskType.LOGS: _ANALYTICS_MODEL_ENV,
+    TaskType.METRICS: _ANALYTICS_MODEL_ENV,
+    TaskType.RCA: _ANALYTICS_MODEL_ENV,
+    TaskType.INCIDENTS: _ANALYTICS_MODEL_ENV,
+    TaskType.COST: _ANALYTICS_MODEL_ENV,
+}
+
+
+@lru_cache(maxsize=32)
+def _resolve_model(task_type: Optional[TaskType] = None) -> str:
+    """
+    Intelligent model selection for Ollama based on task type.
+    
+    Model routing:
+    - Code/Infrastructure tasks -> qwen2.5-coder:32b (optimized for code)
+    - Analytics tasks -> mixtral:8x7b (optimized for reasoning/analysis)
+    
+    Resolved once per task type; call reset_model_cache() after changing
+    the OLLAMA_*_MODEL environment variables at runtime.
+    """
+    env_name = _TASK_MODEL_ENV.get(task_type)
+    if env_name is None:
+        # Unrouted tasks use OLLAMA_MODEL, falling back to the code model
+        return os.getenv("OLLAMA_MODEL") or os.getenv(_CODE_MODEL_ENV, _MODEL_ENV_DEFAULTS[_CODE_MODEL_ENV])
+    
+    model = os.getenv(env_name, _MODEL_ENV_DEFAULTS[env_name])
+    logger.info(f"Task type '{task_type.value}' -> using model: {model} ({env_name})")
+    return model
+
+
+def reset_model_cache():
+    """Re-read the model environment variables on the next request."""
+    _resolve_model.cache_clear()
+
+
+# Shared encoder for nested context values (same output as json.dumps(indent=2))
+_CONTEXT_ENCODER = json.JSONEncoder(indent=2)
+
+
+def _encode_context_value(value: Any) -> str:
+    """Serialize a nested context value as indented JSON for a prompt."""
+    if orjson is not None:
+        # Same layout as the stdlib encoder, but non-ASCII text stays as-is
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return _CONTEXT_ENCODER.encode(value)
+
+
+# Plan step markers: "1.", "12.", "-", "*" or "Step"
+_STEP_RE = re.compile(r"\d+\.|[-*]|Step")
+
+# Characters in the run of markers and spaces leading a recommendation or
+# evidence item, stripped with str.lstrip (several times faster than re.sub)
+_LIST_MARKER_CHARS = " \t\f\v-*0123456789."
+_BULLET_MARKER_CHARS = " \t\f\v-*"
+
+
 class LLMService:
     """
     LLM Service for agent operations
@@ -54,11 +147,14 @@ class LLMService:
         model: Optional[str] = None,
         api_key: Optional[str] = None,
         base_url: Optional[str] = None,
+        max_concurrency: int = 8,
     ):
         self.provider = provider or self._detect_provider()
         self.model = model or self._get_default_model()
         self.api_key = api_key
         self.base_url = base_url
+        # Upper bound on requests chat_batch keeps in flight at once
+        self.max_concurrency = max_concurrency
         self._client = None
     
     def _detect_provider(self) -> LLMProvider:
@@ -67,59 +163,7 @@ class LLMService:
     
     def _get_default_model(self, task_type: Optional[TaskType] = None) -> str:
         """Get default model with intelligent task-based routing"""
-        import os
-        
-        # Check for environment variable override first
-        env_model = os.getenv("OLLAMA_MODEL")
-        if env_model and not task_type:
-            return env_model
-        
-        # Dual-model routing for different task types
-        return self._select_ollama_model(task_type)
-    
-    def _select_ollama_model(self, task_type: Optional[TaskType] = None) -> str:
-        """
-        Intelligent model selection for Ollama based on task type.
-        
-        Model routing:
-        - Code/Infrastructure tasks -> qwen2.5-coder:32b (optimized for code)
-        - Analytics tasks -> mixtral:8x7b (optimized for reasoning/analysis)
-        """
-        import os
-        
-        # Model configuration (can be overridden via env vars)
-        CODE_MODEL = os.getenv("OLLAMA_CODE_MODEL", "qwen2.5-coder:32b")
-        ANALYTICS_MODEL = os.getenv("OLLAMA_ANALYTICS_MODEL", "mixtral:8x7b")
-        DEFAULT_MODEL = os.getenv("OLLAMA_MODEL", CODE_MODEL)
-        
-        if not task_type:
-            return DEFAULT_MODEL
-        
-        # Code-focused tasks -> qwen2.5-coder:32b
-        code_tasks = {
-            TaskType.CODE,
-            TaskType.INFRASTRUCTURE,
-            TaskType.PLAN,
-            TaskType.EXECUTE,
-        }
-        
-        # Analytics-focused tasks -> mixtral:8x7b
-        analytics_tasks = {
-            TaskType.LOGS,
-            TaskType.METRICS,
-            TaskType.RCA,
-            TaskType.INCIDENTS,
-            TaskType.COST,
-        }
-        
-        if task_type in code_tasks:
-            logger.info(f"Task type '{task_type.value}' -> using code model: {CODE_MODEL}")
-            return CODE_MODEL
-        elif task_type in analytics_tasks:
-            logger.info(f"Task type '{task_type.value}' -> using analytics model: {ANALYTICS_MODEL}")
-            return ANALYTICS_MODEL
-        else:
-            return DEFAULT_MODEL
+        return _resolve_model(task_type)
     
     async def _get_client(self):
         """Get Ollama LLM client instance"""
@@ -127,16 +171,20 @@ class LLMService:
             return self._client
         
         # Ollama uses OpenAI-compatible API
-        try:
-            from openai import AsyncOpenAI
-            self._client = AsyncOpenAI(
-                base_url=self.base_url or "http://localhost:11434/v1",
+        if AsyncOpenAI is None:
+            logger.warning("OpenAI SDK not installed for Ollama, using fallback")
+            return None
+        
+        base_url = self.base_url or "http://localhost:11434/v1"
+        client = _clients.get(base_url)
+        if client is None:
+            client = AsyncOpenAI(
+                base_url=base_url,
                 api_key="ollama"  # Ollama doesn't require real API key
             )
-        except ImportError:
-            logger.warning("OpenAI SDK not installed for Ollama, using fallback")
-            self._client = None
+            _clients[base_url] = client
         
+        self._client = client
         return self._client
     
     async def chat(
@@ -210,6 +258,103 @@ class LLMService:
             logger.error(f"LLM API error: {e}")
             return self._fallback_response(messages)
     
+    async def chat_stream(
+        self,
+        messages: List[Dict[str, str]],
+        temperature: float = 0.7,
+        max_tokens: Optional[int] = None,
+        system_prompt: Optional[str] = None,
+        track_usage: bool = True,
+        tenant_id: Optional[str] = None,
+        query_id: Optional[str] = None,
+        mode: Optional[str] = None,
+        task_type: Optional[TaskType] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Streaming chat completion with LLM
+        
+        Same arguments as chat(), but yields text as the model generates it
+        so callers can show or process the first tokens without waiting for
+        (or holding) the whole response. A failure before any text is
+        produced yields the fallback response; one mid-stream is re-raised.
+        
+        Yields:
+            Successive pieces of the generated text
+        """
+        client = await self._get_client()
+        
+        if not client or self.provider != LLMProvider.OLLAMA:
+            # Fallback: return a basic response
+            yield self._fallback_response(messages)
+            return
+        
+        # Select model based on task type (for Ollama dual-model routing)
+        active_model = self._get_default_model(task_type)
+        
+        # Prepare messages
+        chat_messages = []
+        if system_prompt:
+            chat_messages.append({"role": "system", "content": system_prompt})
+        chat_messages.extend(messages)
+        
+        started = False
+        try:
+            response = await client.chat.completions.create(
+                model=active_model,
+                messages=chat_messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            async for chunk in response:
+                if chunk.choices:
+                    content = chunk.choices[0].delta.content
+                    if content:
+                        started = True
+                        yield content
+                
+                # Usage arrives on the final chunk, which has no choices
+                usage = getattr(chunk, "usage", None)
+                if track_usage and usage:
+                    await self._track_usage(
+                        provider=self.provider.value,
+                        model=active_model,
+                        input_tokens=usage.prompt_tokens,
+                        output_tokens=usage.completion_tokens,
+                        total_tokens=usage.total_tokens,
+                        tenant_id=tenant_id,
+                        query_id=query_id,
+                        mode=mode,
+                    )
+        except Exception as e:
+            logger.error(f"LLM API error: {e}")
+            # Text already handed to the caller can't be taken back, and a
+            # fallback appended to it would pass a truncated reply off as
+            # complete: surface the failure instead
+            if started:
+                raise
+            yield self._fallback_response(messages)
+    
+    async def chat_batch(self, requests: List[Dict[str, Any]]) -> List[str]:
+        """
+        Run several independent chat completions concurrently
+        
+        Args:
+            requests: chat() keyword arguments, one dict per completion
+        
+        Returns:
+            Generated text responses, in the same order as requests
+        """
+        # Bounded so a burst of requests doesn't overwhelm the Ollama server
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def run(request: Dict[str, Any]) -> str:
+            async with semaphore:
+                return await self.chat(**request)
+        
+        return await asyncio.gather(*(run(request) for request in requests))
+    
     async def ask_question(
         self,
         question: str,
@@ -324,22 +469,26 @@ Format your response as a structured plan that can be executed."""
     async def analyze_issue(
         self,
         issue_description: str,
-        logs: Optional[List[str]] = None,
+        logs: Optional[Iterable[str]] = None,
         metrics: Optional[Dict[str, Any]] = None,
         code: Optional[str] = None,
         context: Optional[Dict[str, Any]] = None,
-        traces: Optional[List[Dict[str, Any]]] = None,
+        traces: Optional[Iterable[Dict[str, Any]]] = None,
     ) -> Dict[str, Any]:
         """
         Analyze an issue and identify root cause
         
+        Only the first 20 log entries and 10 traces are used, and only
+        those are read, so logs and traces may be generators over large or
+        unbounded sources.
+        
         Args:
             issue_description: Description of the issue
-            logs: Optional log entries
+            logs: Optional log entries (any iterable)
             metrics: Optional metrics data
             code: Optional code to analyze
             context: Optional additional context
-            traces: Optional trace/span data
+            traces: Optional trace/span data (any iterable)
         
         Returns:
             Analysis with root cause and recommendations
@@ -357,21 +506,22 @@ Be thorough but concise. Focus on actionable insights."""
         
         prompt = f"Issue: {issue_description}\n\n"
         
-        if logs:
-            prompt += f"Relevant Logs:\n" + "\n".join(logs[:20]) + "\n\n"  # Limit to 20 logs
+        # Limit to 20 logs
+        log_lines = list(itertools.islice(logs, 20)) if logs is not None else []
+        if log_lines:
+            prompt += f"Relevant Logs:\n" + "\n".join(log_lines) + "\n\n"
         
         if metrics:
             prompt += f"Metrics:\n{self._format_context(metrics)}\n\n"
         
-        if traces:
-            # Format traces for analysis
-            trace_summary = []
-            for trace in traces[:10]:  # Limit to 10 traces
-                trace_summary.append(
-                    f"Trace {trace.get('trace_id', 'unknown')[:8]}: "
-                    f"{trace.get('service', 'unknown')} - {trace.get('operation', 'unknown')} "
-                    f"({trace.get('duration_ms', 0):.2f}ms, status: {trace.get('status', 'unknown')})"
-                )
+        # Format traces for analysis (limit to 10 traces)
+        trace_summary = [
+            f"Trace {trace.get('trace_id', 'unknown')[:8]}: "
+            f"{trace.get('service', 'unknown')} - {trace.get('operation', 'unknown')} "
+            f"({trace.get('duration_ms', 0):.2f}ms, status: {trace.get('status', 'unknown')})"
+            for trace in (itertools.islice(traces, 10) if traces is not None else ())
+        ]
+        if trace_summary:
             prompt += f"Relevant Traces:\n" + "\n".join(trace_summary) + "\n\n"
         
         if code:
@@ -394,27 +544,23 @@ Be thorough but concise. Focus on actionable insights."""
         lines = []
         for key, value in context.items():
             if isinstance(value, (dict, list)):
-                import json
-                lines.append(f"{key}: {json.dumps(value, indent=2)}")
+                lines.append(f"{key}: {_encode_context_value(value)}")
             else:
                 lines.append(f"{key}: {value}")
         return "\n".join(lines)
     
     def _parse_plan(self, plan_text: str) -> Dict[str, Any]:
         """Parse plan text into structured format"""
-        lines = plan_text.split("\n")
         steps = []
         current_step = None
         
-        for line in lines:
+        for line in plan_text.splitlines():
             line = line.strip()
             if not line:
                 continue
             
             # Detect step markers
-            if line.startswith(("1.", "2.", "3.", "4.", "5.", "6.", "7.", "8.", "9.")) or \
-               line.startswith(("-", "*")) or \
-               line.startswith("Step"):
+            if _STEP_RE.match(line):
                 if current_step:
                     steps.append(current_step)
                 current_step = {"description": line, "details": []}
@@ -440,10 +586,11 @@ Be thorough but concise. Focus on actionable insights."""
         recommendations = []
         evidence = []
         
-        lines = analysis_text.split("\n")
         current_section = None
         
-        for line in lines:
+        for line in analysis_text.splitlines():
+            # Plain substring tests on one lowered copy beat a regex here:
+            # headings can appear anywhere in the line
             line_lower = line.lower()
             if "root cause" in line_lower:
                 root_cause = line.split(":", 1)[1].strip() if ":" in line else line
@@ -454,10 +601,19 @@ Be thorough but concise. Focus on actionable insights."""
                     recommendations.append(line.split(":", 1)[1].strip())
             elif "evidence" in line_lower or "supporting" in line_lower:
                 current_section = "evidence"
-            elif current_section == "recommendations" and line.strip().startswith(("-", "*", "1.", "2.")):
-                recommendations.append(line.strip().lstrip("-*123456789. "))
-            elif current_section == "evidence" and line.strip().startswith(("-", "*")):
-                evidence.append(line.strip().lstrip("-* "))
+            elif current_section == "recommendations":
+                # Bulleted or numbered ("1.", "12.") items
+                item = line.lstrip()
+                marker = item[:1]
+                if marker == "-" or marker == "*" or (
+                    marker.isdigit() and item.lstrip("0123456789")[:1] == "."
+                ):
+                    recommendations.append(item.lstrip(_LIST_MARKER_CHARS).rstrip())
+            elif current_section == "evidence":
+                # Bulleted items
+                item = line.lstrip()
+                if item.startswith(("-", "*")):
+                    evidence.append(item.lstrip(_BULLET_MARKER_CHARS).rstrip())
         
         # If no structured sections found, use first paragraph as root cause
         if not root_cause:
@@ -539,7 +695,6 @@ def get_llm_service() -> LLMService:
     global _llm_service
     
     if not _llm_service:
-        import os
         _llm_service = LLMService(
             base_url=os.getenv("OLLAMA_BASE_URL"),
         )
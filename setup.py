@@ -41,6 +41,15 @@ setup(
         "asyncio",
     ],
     extras_require={
+        "zstd": [
+            "zstandard>=0.21.0",
+        ],
+        "orjson": [
+            "orjson>=3.9.0",
+        ],
+        "isal": [
+            "isal>=1.0.0",
+        ],
         "dev": [
             "pytest>=7.0.0",
             "pytest-asyncio>=0.21.0",